@@ -1,4 +1,20 @@
 """lmi package: Unified Platform CLI and configuration."""
 
-from . import auth  # noqa: F401
-from .plugins import CliContext
+import importlib
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve heavy package attributes on first access.
+
+    Importing ``lmi`` (e.g. for ``lmi --version``) should not pull in httpx,
+    authlib or pluggy; ``lmi.auth`` and ``lmi.CliContext`` are loaded on demand.
+    """
+    if name == "auth":
+        return importlib.import_module(".auth", __name__)
+    if name == "CliContext":
+        from .plugins import CliContext
+
+        return CliContext
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
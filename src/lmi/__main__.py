@@ -1,21 +1,176 @@
 """Main entry point for the lmi CLI application."""
 
+import importlib
 import logging
 import sys
-from typing import Optional
 
 import click
 
-from lmi.auth import AuthenticatedClient
-from lmi.cli.auth import auth as auth_group
+from lmi.cli.io import format_output, read_input_file  # noqa: F401  (re-exported for plugins)
 from lmi.config import load_config
-from lmi.logging import setup_logging
-from lmi.plugins import CliContext, plugin_manager
+
+VERSION = "0.1.0"
+
+logger = logging.getLogger(__name__)
+plugin_logger = logging.getLogger("lmi.plugins")
+
+
+class LazyGroup(click.Group):
+    """Click group that imports built-in subcommands only when they are used.
+
+    Args:
+        lazy_subcommands: Mapping of command name to ``"module.attribute"``
+            import path of the click command object.
+
+    """
+
+    def __init__(self, *args, lazy_subcommands: dict[str, str] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands:
+            return self._load_lazy(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_lazy(self, cmd_name: str) -> click.Command:
+        module_name, attr = self.lazy_subcommands[cmd_name].rsplit(".", 1)
+        return getattr(importlib.import_module(module_name), attr)
+
+
+class PluginGroup(LazyGroup):
+    """Root CLI group that loads a plugin only when its command is invoked.
+
+    A plugin is looked up by entry point name in the ``lmi_plugins`` group, so
+    the entry point name must match the command it registers. Only that plugin
+    is imported, and it receives a CliContext built from the global options.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.plugin_commands: set[str] = set()
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        # Help output needs no logging; let the group callback skip setting it up.
+        # Arguments after a "--" terminator are values (e.g. `lmi svc run -- grep --help`)
+        options = args[:args.index("--")] if "--" in args else args
+        ctx.meta["lmi.help_requested"] = any(arg in ctx.help_option_names for arg in options)
+        return super().parse_args(ctx, args)
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.plugin_commands:
+            command = super().get_command(ctx, cmd_name)
+            if command is not None:
+                return command
+        from lmi.plugins import plugin_manager
+
+        if not plugin_manager.load_plugin(cmd_name):
+            return super().get_command(ctx, cmd_name)
+        # click resolves the subcommand before running the group callback; configure logging
+        # first so config loading and token acquisition are logged
+        setup_cli_logging(ctx)
+        # Re-run registration on every resolution so the plugin sees this invocation's context
+        context = build_plugin_context(ctx.params, help_requested=ctx.meta.get("lmi.help_requested", False))
+        plugin_manager.pm.hook.register_commands(cli=self, context=context)
+        self.plugin_commands.add(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        super().format_commands(ctx, formatter)
+        # List installed plugins from entry point metadata alone, without importing them
+        from lmi.plugins import plugin_manager
+
+        listed = set(self.list_commands(ctx))
+        rows = [
+            (name, f"Provided by {ep.dist.name}" if ep.dist else "Installed plugin")
+            for name, ep in sorted(plugin_manager.entry_points().items())
+            if name not in listed
+        ]
+        if rows:
+            with formatter.section("Plugins"):
+                formatter.write_dl(rows)
+
+
+def parse_config_overrides(cli_config_overrides: tuple[str, ...]) -> dict[str, str]:
+    """Parse ``-C KEY=VALUE`` options into a dictionary.
+
+    Raises:
+        click.BadParameter: If an override is not in KEY=VALUE format.
+
+    """
+    parsed_overrides = {}
+    for override in cli_config_overrides:
+        key, sep, value = override.partition("=")
+        if not sep:
+            raise click.BadParameter(f"Config overrides must be in KEY=VALUE format: {override}")
+        parsed_overrides[key] = value
+    return parsed_overrides
+
+
+def setup_cli_logging(ctx: click.Context) -> None:
+    """Configure logging from the global options, once per invocation and not for help output."""
+    if ctx.meta.get("lmi.help_requested") or ctx.meta.get("lmi.logging_configured"):
+        return
+    from lmi.logging import setup_logging
+
+    setup_logging(verbosity=ctx.params.get("verbose") or 0, disable_file=bool(ctx.params.get("no_file_log")))
+    ctx.meta["lmi.logging_configured"] = True
+    logger.info("lmi CLI starting up")
+
+
+def build_plugin_context(params: dict, help_requested: bool = False):
+    """Load configuration and build the CliContext handed to plugins.
+
+    Args:
+        params: Parsed global options of the root CLI group.
+        help_requested: Whether only help output is needed; the plugin then gets an
+            empty configuration and no HTTP client, so no config is read and no token
+            is fetched.
+
+    Raises:
+        click.Abort: If the configuration cannot be loaded.
+
+    """
+    from lmi.plugins import CliContext
+
+    environment = params.get("environment")
+    global_flags = {
+        "environment": environment,
+        "verbose": params.get("verbose"),
+        "no_file_log": params.get("no_file_log"),
+        "output": params.get("output"),
+    }
+    if help_requested:
+        return CliContext({}, plugin_logger, None, global_flags)
+
+    from lmi.auth import get_authenticated_client
+
+    try:
+        config = load_config(
+            environment=environment,
+            cli_args=parse_config_overrides(params.get("cli_config_overrides") or ()),
+        )
+        logger.info("Configuration loaded successfully")
+        client = get_authenticated_client(config, environment or config.get("default_environment"))
+    except RuntimeError as e:
+        click.echo(f"Config error: {e}", err=True)
+        raise click.Abort() from e
+    return CliContext(config, plugin_logger, client, global_flags)
 
 
 def create_cli():
-    @click.group()
-    @click.version_option("0.1.0", message="%(version)s")
+    @click.group(
+        cls=PluginGroup,
+        lazy_subcommands={
+            "auth": "lmi.cli.auth.auth",
+            "daemon": "lmi.cli.daemon.daemon",
+            "plugin": "lmi.cli.plugin.plugin",
+        },
+    )
+    @click.version_option(VERSION, message="%(version)s")
     @click.option(
         "-e",
         "--environment",
@@ -60,8 +215,7 @@ def create_cli():
             cli_config_overrides: List of KEY=VALUE pairs to override configuration
 
         """
-        setup_logging(verbosity=verbose, disable_file=no_file_log)
-        logging.getLogger(__name__).info("lmi CLI starting up")
+        setup_cli_logging(ctx)
         # Store global options in context for later use
         ctx.ensure_object(dict)
         ctx.obj["environment"] = environment
@@ -70,127 +224,21 @@ def create_cli():
         ctx.obj["output"] = output
         
         # Parse config overrides
-        parsed_overrides = {}
-        for override in cli_config_overrides:
-            if '=' not in override:
-                raise click.BadParameter(f"Config overrides must be in KEY=VALUE format: {override}")
-            key, value = override.split('=', 1)
-            parsed_overrides[key] = value
-        ctx.obj["config_overrides"] = parsed_overrides
-
-    # Add auth commands
-    cli.add_command(auth_group)
-
-    @cli.result_callback()
-    @click.pass_context
-    def process_result(ctx, *args, **kwargs):
-        # Only run if a subcommand was actually invoked (not for --help/--version)
-        if ctx.invoked_subcommand is None:
-            return
-        environment = ctx.obj.get("environment")
-        verbose = ctx.obj.get("verbose")
-        no_file_log = ctx.obj.get("no_file_log")
-        output = ctx.obj.get("output")
-        config_overrides = ctx.obj.get("config_overrides", {})
-        try:
-            config = load_config(environment=environment, cli_args=config_overrides)
-            logging.getLogger(__name__).info("Configuration loaded successfully")
-            logger = logging.getLogger("lmi.plugins")
-            client = AuthenticatedClient(config, environment or config.get("default_environment"))
-            global_flags = {"environment": environment, "verbose": verbose, "no_file_log": no_file_log, "output": output}
-            context = CliContext(config, logger, client, global_flags)
-            # Register plugins
-            plugin_manager.register_plugins(ctx.command, context)
-        except RuntimeError as e:
-            logging.getLogger(__name__).error(f"Config error: {e}")
-            click.echo(f"Config error: {e}", err=True)
-            raise click.Abort() from e
-
-    @cli.group()
-    def plugin():
-        """Manage lmi plugins (install, uninstall, list)."""
-
-    @plugin.command()
-    @click.argument("package")
-    @click.option("--index-url", help="Custom package index URL (optional)")
-    def install(package, index_url):
-        """Install a plugin from PyPI or a custom index."""
-        import subprocess
-        cmd = ["uv", "pip", "install", package]
-        if index_url:
-            cmd += ["--index-url", index_url]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        if result.returncode == 0:
-            click.echo(f"Plugin '{package}' installed successfully.")
-        else:
-            click.echo(result.stderr, err=True)
-            raise click.ClickException(f"Failed to install plugin '{package}'")
-
-    @plugin.command()
-    @click.argument("package")
-    def uninstall(package):
-        """Uninstall a plugin by package name."""
-        import subprocess
-        cmd = ["uv", "pip", "uninstall", "-y", package]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        if result.returncode == 0:
-            click.echo(f"Plugin '{package}' uninstalled successfully.")
-        else:
-            click.echo(result.stderr, err=True)
-            raise click.ClickException(f"Failed to uninstall plugin '{package}'")
-
-    @plugin.command()
-    def list():
-        """List installed lmi plugins and their versions."""
-        import importlib.metadata
-        plugins = importlib.metadata.entry_points().get("lmi_plugins", [])
-        if not plugins:
-            click.echo("No plugins installed.")
-            return
-        data = [
-            {"name": ep.name, "module": ep.value, "version": importlib.metadata.version(ep.dist.name)}
-            for ep in plugins
-        ]
-        format_output(data, output_format="json")
+        ctx.obj["config_overrides"] = parse_config_overrides(cli_config_overrides)
 
     return cli
 
-# Output formatting utility
-import json as _json
 
+cli = create_cli()
 
-def format_output(data, output_format: str = "json"):
-    if output_format == "json":
-        click.echo(_json.dumps(data, indent=2, ensure_ascii=False))
-    else:
-        click.echo(str(data))
 
-def read_input_file(file: Optional[str]) -> str:
-    """
-    Read input data from a file or STDIN.
-    If file is '-', read from sys.stdin.
-    Returns the input as a string.
-    Raises click.ClickException on error or empty input.
-    """
-    if file is None:
-        raise click.ClickException("No input file specified.")
-    if file == "-":
-        data = sys.stdin.read()
-        if not data.strip():
-            raise click.ClickException("STDIN is empty. Provide input data or use --file <path>.")
-        return data
-    try:
-        with open(file, encoding="utf-8") as f:
-            data = f.read()
-            if not data.strip():
-                raise click.ClickException(f"Input file '{file}' is empty.")
-            return data
-    except FileNotFoundError:
-        raise click.ClickException(f"Input file not found: {file}")
-    except Exception as e:
-        raise click.ClickException(f"Failed to read input file '{file}': {e}")
+def main() -> None:
+    """Run the CLI, answering a bare ``--version`` without parsing arguments."""
+    if sys.argv[1:] == ["--version"]:
+        sys.stdout.write(f"{VERSION}\n")
+        return
+    cli()
 
-cli = create_cli()
 
 if __name__ == "__main__":
-    cli()
+    main()
@@ -1,30 +1,78 @@
 """Authentication and token management for lmi CLI (OAuth2, token caching, refresh)."""
 
+import atexit
 import base64
 import hashlib
+import hmac
 import json
 import logging
+import os
 import secrets
+import tempfile
 import time
-import webbrowser
 from dataclasses import dataclass, field
+from functools import lru_cache
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
-from threading import Event, Thread
+from threading import Event
 from typing import Any, Optional
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
 
 import httpx
-from authlib.integrations.httpx_client import OAuth2Client
-from authlib.oauth2.rfc7636 import create_s256_code_challenge
+
+try:
+    import orjson
+except ImportError:  # optional speedup, installed with the "fast" extra
+    orjson = None
 
 TOKEN_CACHE_DIR = Path.home() / ".cache" / "lmi" / "tokens"
+# Seconds to wait for the browser to return from the authorization server
+PKCE_CALLBACK_TIMEOUT = 300
+# Seconds before expiry at which AuthenticatedClient refreshes a token ahead of the next request
+TOKEN_REFRESH_MARGIN = 30
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Shared client for token endpoint requests so refresh and acquire reuse one keep-alive connection
+_TOKEN_HTTP_CLIENT: Optional[httpx.Client] = None
+
+def _get_token_http_client() -> httpx.Client:
+    global _TOKEN_HTTP_CLIENT
+    if _TOKEN_HTTP_CLIENT is None:
+        _TOKEN_HTTP_CLIENT = httpx.Client(timeout=10)
+    return _TOKEN_HTTP_CLIENT
+
+def _close_token_http_client() -> None:
+    global _TOKEN_HTTP_CLIENT
+    if _TOKEN_HTTP_CLIENT is not None:
+        _TOKEN_HTTP_CLIENT.close()
+        _TOKEN_HTTP_CLIENT = None
+
+# Registered once rather than per client, since the client is recreated after each close
+atexit.register(_close_token_http_client)
+
+def _json_dumps(data: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _response_json(resp: httpx.Response) -> Any:
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+@dataclass(slots=True, frozen=True)
 class AuthToken:
-    """Unified token container for all authentication methods."""
+    """Unified token container for all authentication methods.
+
+    Instances are immutable, so the same token can be shared between the
+    in-memory cache and its callers.
+    """
     access_token: str
     expires_at: int
     token_type: str = "Bearer"
@@ -60,33 +108,83 @@ class AuthToken:
         """Check if the token is expired."""
         return time.time() >= self.expires_at
 
+# Tokens last read from or written to the cache, keyed by path and tagged with the file's (mtime_ns, size)
+_TOKEN_MEM_CACHE: dict[Path, tuple[int, int, AuthToken]] = {}
+
+@lru_cache(maxsize=32)
+def _token_cache_path(cache_dir: Path, env_name: str) -> Path:
+    return cache_dir / f"{env_name}.json"
+
 def get_token_cache_path(env_name: str) -> Path:
-    TOKEN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    return TOKEN_CACHE_DIR / f"{env_name}.json"
+    return _token_cache_path(TOKEN_CACHE_DIR, env_name)
 
-def load_cached_token(env_name: str) -> Optional[AuthToken]:
+def _read_cached_token(env_name: str) -> Optional[AuthToken]:
+    """Return the cached token for an environment, expired or not."""
     path = get_token_cache_path(env_name)
-    if path.exists():
-        with open(path, encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                token = AuthToken.from_dict(data)
-                if not token.is_expired:
-                    logger.debug(f"Loaded valid cached token for {env_name}")
-                    return token
-                logger.info(f"Cached token for {env_name} expired")
-            except Exception as e:
-                logger.warning(f"Failed to load cached token: {e}")
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    cached = _TOKEN_MEM_CACHE.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    try:
+        data = _json_loads(path.read_bytes())
+        token = AuthToken.from_dict(data)
+    except Exception as e:
+        logger.warning("Failed to load cached token: %s", e)
+        return None
+    _TOKEN_MEM_CACHE[path] = (st.st_mtime_ns, st.st_size, token)
+    return token
+
+def load_cached_token(env_name: str) -> Optional[AuthToken]:
+    token = _read_cached_token(env_name)
+    if token is None:
+        return None
+    if not token.is_expired:
+        logger.debug("Loaded valid cached token for %s", env_name)
+        return token
+    logger.info("Cached token for %s expired", env_name)
     return None
 
 def save_token(env_name: str, token: AuthToken) -> None:
     path = get_token_cache_path(env_name)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(token.to_dict(), f)
-    logger.debug(f"Saved token to cache for {env_name}")
+    cached = _TOKEN_MEM_CACHE.get(path)
+    if cached is not None and cached[2] == token:
+        # Skip the rewrite if the file still holds exactly this token
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            st = None
+        if st is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            logger.debug("Token for %s unchanged, not rewriting cache", env_name)
+            return
+    # Write a private temp file and swap it in, so readers never see a partial cache
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    except FileNotFoundError:
+        # First save on this machine (or the cache was wiped): create the directory once
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_json_dumps(token.to_dict()))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    st = path.stat()
+    _TOKEN_MEM_CACHE[path] = (st.st_mtime_ns, st.st_size, token)
+    logger.debug("Saved token to cache for %s", env_name)
+
+def clear_cached_token(env_name: str) -> None:
+    path = get_token_cache_path(env_name)
+    path.unlink(missing_ok=True)
+    _TOKEN_MEM_CACHE.pop(path, None)
+    logger.debug("Cleared cached token for %s", env_name)
 
 def is_token_expired(token: dict[str, Any]) -> bool:
-    import time
+    """Check expiry of a raw token dictionary (kept for callers predating AuthToken)."""
     expires_at = token.get("expires_at")
     if expires_at is None:
         # Fallback: check expires_in and issued_at
@@ -95,43 +193,71 @@ def is_token_expired(token: dict[str, Any]) -> bool:
         expires_at = issued_at + expires_in
     return time.time() >= expires_at
 
-class SSOCallbackHandler(BaseHTTPRequestHandler):
-    """HTTP server to handle the OAuth callback."""
+_SSO_OK_HTML = (
+    b"<html><body><h1>Authentication successful!</h1>"
+    b"<p>You can close this window and return to the CLI.</p></body></html>"
+)
+_SSO_OK_HTML_LENGTH = str(len(_SSO_OK_HTML))
+
+class SSOCallbackServer(HTTPServer):
+    """Local HTTP server receiving the OAuth redirect; its handler records the outcome here."""
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
         self.auth_code: Optional[str] = None
         self.state: Optional[str] = None
         self.error: Optional[str] = None
         self.done = Event()
-        super().__init__(*args, **kwargs)
+        # Socket timeout for each accepted connection, so an idle one can't outlast the login deadline
+        self.request_timeout: Optional[float] = None
+
+    def get_request(self) -> tuple[Any, Any]:
+        conn, addr = super().get_request()
+        conn.settimeout(self.request_timeout)
+        return conn, addr
+
+class SSOCallbackHandler(BaseHTTPRequestHandler):
+    """HTTP request handler for the OAuth callback."""
+
+    server: SSOCallbackServer
+    # The response is written in two sends (headers, then body); don't let Nagle hold back the second
+    disable_nagle_algorithm = True
 
     def do_GET(self) -> None:
         """Handle GET request from OAuth callback."""
+        url = urlsplit(self.path)
+        if url.path != "/callback":
+            # Stray browser requests such as /favicon.ico must not end the wait for the redirect
+            self.send_error(404)
+            return
         try:
-            query = parse_qs(urlparse(self.path).query)
-            self.auth_code = query.get("code", [None])[0]
-            self.state = query.get("state", [None])[0]
-            self.error = query.get("error", [None])[0]
+            query = dict(parse_qsl(url.query, max_num_fields=16))
+            self.server.auth_code = query.get("code")
+            self.server.state = query.get("state")
+            self.server.error = query.get("error")
 
-            if self.error:
-                self.send_error(400, f"Authorization failed: {self.error}")
+            if self.server.error:
+                self.send_error(400, f"Authorization failed: {self.server.error}")
             else:
-                self.send_response(200)
-                self.send_header("Content-type", "text/html")
+                self.send_response_only(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", _SSO_OK_HTML_LENGTH)
                 self.end_headers()
-                self.wfile.write(
-                    b"<html><body><h1>Authentication successful!</h1>"
-                    b"<p>You can close this window and return to the CLI.</p></body></html>"
-                )
+                self.wfile.write(_SSO_OK_HTML)
         except Exception as e:
-            logger.error(f"Error handling callback: {e}")
+            logger.error("Error handling callback: %s", e)
             self.send_error(500, str(e))
         finally:
-            self.done.set()
+            self.server.done.set()
 
     def log_message(self, format: str, *args: Any) -> None:
         """Override to use our logger."""
-        logger.debug(f"SSO callback server: {format % args}")
+        logger.debug("SSO callback server: " + format, *args)
+
+def _s256_code_challenge(code_verifier: str) -> str:
+    """Derive the PKCE S256 code challenge (RFC 7636, section 4.2)."""
+    digest = hashlib.sha256(code_verifier.encode("ascii")).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
 
 def _acquire_pkce_token(config: dict[str, str], env_name: str) -> Optional[AuthToken]:
     """Acquire a token using PKCE flow.
@@ -146,59 +272,58 @@ def _acquire_pkce_token(config: dict[str, str], env_name: str) -> Optional[AuthT
     Raises:
         RuntimeError: If PKCE flow fails.
     """
+    # Only the interactive flow needs these; authlib in particular is slow to import
+    import webbrowser
+
+    from authlib.integrations.httpx_client import OAuth2Client
+
     client_id = config["OAUTH_CLIENT_ID"]
     auth_url = config["OAUTH_AUTHORIZE_URL"]
     token_url = config["OAUTH_TOKEN_URL"]
-    scopes = config.get("OAUTH_SCOPES", "openid profile email offline_access").split()
+    # Normalize whitespace between scopes once; the value is sent space-separated
+    scope = " ".join(config.get("OAUTH_SCOPES", "openid profile email offline_access").split())
     
     # Generate PKCE values
     code_verifier = secrets.token_urlsafe(64)
-    code_challenge = create_s256_code_challenge(code_verifier)
+    code_challenge = _s256_code_challenge(code_verifier)
     state = secrets.token_urlsafe(32)
     
     # Start local server for callback
-    server = HTTPServer(("localhost", 0), SSOCallbackHandler)
+    server = SSOCallbackServer(("localhost", 0), SSOCallbackHandler)
     port = server.server_address[1]
     callback_uri = f"http://localhost:{port}/callback"
-    
-    # Store handler instance for waiting
-    handler_instance = None
-    def handler_factory(*args, **kwargs):
-        nonlocal handler_instance
-        handler_instance = SSOCallbackHandler(*args, **kwargs)
-        return handler_instance
-    server.RequestHandlerClass = handler_factory
-    
+
     # Construct authorization URL
     auth_params = {
         "response_type": "code",
         "client_id": client_id,
         "redirect_uri": callback_uri,
-        "scope": " ".join(scopes),
+        "scope": scope,
         "code_challenge": code_challenge,
         "code_challenge_method": "S256",
         "state": state,
     }
-    auth_url = f"{auth_url}?{'&'.join(f'{k}={v}' for k, v in auth_params.items())}"
-    
-    # Open browser and wait for callback
-    logger.info("Opening browser for SSO login...")
-    webbrowser.open(auth_url)
-    
-    # Wait for callback
-    server_thread = Thread(target=server.serve_forever)
-    server_thread.daemon = True
-    server_thread.start()
-    
+    auth_url = f"{auth_url}?{urlencode(auth_params, quote_via=quote)}"
+
     try:
-        # Wait for callback with timeout
-        if not handler_instance or not handler_instance.done.wait(timeout=300):  # 5 minutes timeout
-            raise RuntimeError("SSO login timed out")
-        if handler_instance.error:
-            raise RuntimeError(f"SSO login failed: {handler_instance.error}")
-        if not handler_instance.auth_code or not handler_instance.state:
+        # Open browser and wait for callback
+        logger.info("Opening browser for SSO login...")
+        webbrowser.open(auth_url)
+        # Serve requests on this thread until the callback arrives or time runs out
+        deadline = time.monotonic() + PKCE_CALLBACK_TIMEOUT
+        while not server.done.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RuntimeError("SSO login timed out")
+            # Bounds both the wait for a connection and the read from it (e.g. an idle browser preconnect)
+            server.timeout = server.request_timeout = remaining
+            server.handle_request()
+        if server.error:
+            raise RuntimeError(f"SSO login failed: {server.error}")
+        if not server.auth_code or not server.state:
             raise RuntimeError("Invalid callback response")
-        if handler_instance.state != state:
+        # Constant-time comparison; encoded because compare_digest rejects non-ASCII str
+        if not hmac.compare_digest(server.state.encode(), state.encode()):
             raise RuntimeError("State mismatch - possible CSRF attack")
         
         # Exchange code for tokens
@@ -210,7 +335,7 @@ def _acquire_pkce_token(config: dict[str, str], env_name: str) -> Optional[AuthT
         token_data = client.fetch_token(
             token_url,
             grant_type="authorization_code",
-            code=handler_instance.auth_code,
+            code=server.auth_code,
             code_verifier=code_verifier,
             redirect_uri=callback_uri,
         )
@@ -228,7 +353,6 @@ def _acquire_pkce_token(config: dict[str, str], env_name: str) -> Optional[AuthT
         )
     
     finally:
-        server.shutdown()
         server.server_close()
 
 def acquire_token(config: dict[str, str], grant_type: str = "client_credentials") -> AuthToken:
@@ -252,22 +376,21 @@ def acquire_token(config: dict[str, str], grant_type: str = "client_credentials"
         raise ValueError(f"Unsupported grant_type: {grant_type}")
     
     token_url = config["OAUTH_TOKEN_URL"]
-    logger.info(f"Requesting new token from {token_url} using {grant_type}")
-    with httpx.Client(timeout=10) as client:
-        resp = client.post(token_url, data=data)
-        resp.raise_for_status()
-        token_data = resp.json()
-        # Add expiry calculation
-        issued_at = int(time.time())
-        expires_at = issued_at + int(token_data.get("expires_in", 3600))
-        return AuthToken(
-            access_token=token_data["access_token"],
-            refresh_token=token_data.get("refresh_token"),
-            id_token=token_data.get("id_token"),
-            expires_at=expires_at,
-            token_type=token_data.get("token_type", "Bearer"),
-            issued_at=issued_at,
-        )
+    logger.info("Requesting new token from %s using %s", token_url, grant_type)
+    resp = _get_token_http_client().post(token_url, data=data)
+    resp.raise_for_status()
+    token_data = _response_json(resp)
+    # Add expiry calculation
+    issued_at = int(time.time())
+    expires_at = issued_at + int(token_data.get("expires_in", 3600))
+    return AuthToken(
+        access_token=token_data["access_token"],
+        refresh_token=token_data.get("refresh_token"),
+        id_token=token_data.get("id_token"),
+        expires_at=expires_at,
+        token_type=token_data.get("token_type", "Bearer"),
+        issued_at=issued_at,
+    )
 
 def get_token(config: dict[str, str], env_name: str, allow_interactive_for_new: bool = False, force_new: bool = False) -> Optional[AuthToken]:
     """Get a valid token, refreshing or acquiring a new one if necessary.
@@ -282,17 +405,22 @@ def get_token(config: dict[str, str], env_name: str, allow_interactive_for_new:
         Optional[AuthToken]: A valid token, or None if acquisition fails.
     """
     if not force_new:
-        # Try to load cached token
-        token = load_cached_token(env_name)
-        if token and not token.is_expired:
-            return token
-        
-        # Try to refresh if we have a refresh token
-        if token and token.refresh_token:
-            try:
-                return _refresh_auth_token(token, config)
-            except Exception as e:
-                logger.warning(f"Token refresh failed: {e}")
+        # Try the cached token, checking its expiry once
+        token = _read_cached_token(env_name)
+        if token is not None:
+            if not token.is_expired:
+                logger.debug("Loaded valid cached token for %s", env_name)
+                return token
+            logger.info("Cached token for %s expired", env_name)
+
+            # Try to refresh if we have a refresh token
+            if token.refresh_token:
+                try:
+                    token = _refresh_auth_token(token, config)
+                    save_token(env_name, token)
+                    return token
+                except Exception as e:
+                    logger.warning("Token refresh failed: %s", e)
     
     # Acquire new token
     try:
@@ -306,7 +434,7 @@ def get_token(config: dict[str, str], env_name: str, allow_interactive_for_new:
             save_token(env_name, token)
         return token
     except Exception as e:
-        logger.error(f"Failed to acquire token: {e}")
+        logger.error("Failed to acquire token: %s", e)
         return None
 
 def _refresh_auth_token(token: AuthToken, config: dict[str, str]) -> AuthToken:
@@ -333,21 +461,20 @@ def _refresh_auth_token(token: AuthToken, config: dict[str, str]) -> AuthToken:
     }
     
     token_url = config["OAUTH_TOKEN_URL"]
-    with httpx.Client(timeout=10) as client:
-        resp = client.post(token_url, data=data)
-        resp.raise_for_status()
-        token_data = resp.json()
-        
-        issued_at = int(time.time())
-        expires_at = issued_at + int(token_data.get("expires_in", 3600))
-        return AuthToken(
-            access_token=token_data["access_token"],
-            refresh_token=token_data.get("refresh_token", token.refresh_token),
-            id_token=token_data.get("id_token", token.id_token),
-            expires_at=expires_at,
-            token_type=token_data.get("token_type", "Bearer"),
-            issued_at=issued_at,
-        )
+    resp = _get_token_http_client().post(token_url, data=data)
+    resp.raise_for_status()
+    token_data = _response_json(resp)
+
+    issued_at = int(time.time())
+    expires_at = issued_at + int(token_data.get("expires_in", 3600))
+    return AuthToken(
+        access_token=token_data["access_token"],
+        refresh_token=token_data.get("refresh_token", token.refresh_token),
+        id_token=token_data.get("id_token", token.id_token),
+        expires_at=expires_at,
+        token_type=token_data.get("token_type", "Bearer"),
+        issued_at=issued_at,
+    )
 
 class AuthenticatedClient:
     def __init__(self, config: dict[str, str], env_name: str):
@@ -357,33 +484,61 @@ class AuthenticatedClient:
         if not self.token:
             raise RuntimeError("Failed to acquire initial token")
         self.client = httpx.Client(timeout=10)
+        self._apply_token()
+
+    def _apply_token(self) -> None:
+        """Set the Authorization header once per token; httpx merges it into every request."""
         self.client.headers["Authorization"] = f"{self.token.token_type} {self.token.access_token}"
 
     def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self.token.refresh_token:
+            if time.time() >= self.token.expires_at - TOKEN_REFRESH_MARGIN:
+                self._refresh_early()
+        elif self.token.is_expired:
+            self._reload_token()
         resp = self.client.request(method, url, **kwargs)
         if resp.status_code == 401:
-            logger.warning("401 Unauthorized: refreshing token and retrying once")
-            # Try to refresh token
-            if self.token and self.token.refresh_token:
-                try:
-                    self.token = _refresh_auth_token(self.token, self.config)
-                    save_token(self.env_name, self.token)
-                    self.client.headers["Authorization"] = f"{self.token.token_type} {self.token.access_token}"
-                    resp = self.client.request(method, url, **kwargs)
-                except Exception as e:
-                    logger.error(f"Token refresh failed: {e}")
-                    # Invalidate cache
-                    save_token(self.env_name, AuthToken(
-                        access_token="",
-                        refresh_token=None,
-                        id_token=None,
-                        expires_at=0
-                    ))
-                    raise RuntimeError("Authentication failed and token refresh unsuccessful") from e
-            else:
-                raise RuntimeError("Authentication failed and no refresh token available")
+            return self._handle_401(method, url, kwargs)
         return resp
 
+    def _refresh_early(self) -> None:
+        """Refresh a token that is about to expire, saving the server a 401 round trip."""
+        try:
+            self.token = _refresh_auth_token(self.token, self.config)
+        except Exception as e:
+            # Send with the current token; a 401 still goes through _handle_401
+            logger.warning("Early token refresh failed: %s", e)
+            return
+        save_token(self.env_name, self.token)
+        self._apply_token()
+
+    def _reload_token(self) -> None:
+        """Replace an expired, non-refreshable token with a cached or newly acquired one."""
+        # A pooled client outlives its token, e.g. a client-credentials token under `lmi daemon`
+        token = get_token(self.config, self.env_name)
+        if token is not None:
+            self.token = token
+            self._apply_token()
+
+    def _handle_401(self, method: str, url: str, kwargs: dict[str, Any]) -> httpx.Response:
+        """Refresh the token and retry a request once after a 401 response."""
+        logger.warning("401 Unauthorized: refreshing token and retrying once")
+        if not (self.token and self.token.refresh_token):
+            # The server rejected the token; don't let the next run reload it from the cache
+            clear_cached_token(self.env_name)
+            _discard_pooled_client(self)
+            raise RuntimeError("Authentication failed and no refresh token available")
+        try:
+            self.token = _refresh_auth_token(self.token, self.config)
+            save_token(self.env_name, self.token)
+            self._apply_token()
+            return self.client.request(method, url, **kwargs)
+        except Exception as e:
+            logger.error("Token refresh failed: %s", e)
+            clear_cached_token(self.env_name)
+            _discard_pooled_client(self)
+            raise RuntimeError("Authentication failed and token refresh unsuccessful") from e
+
     def get(self, url: str, **kwargs) -> httpx.Response:
         return self.request("GET", url, **kwargs)
 
@@ -398,3 +553,52 @@ class AuthenticatedClient:
     
     def close(self):
         self.client.close()
+
+# Clients shared across invocations of a long-lived process, keyed by environment and config
+_CLIENT_POOL: dict[tuple[str, frozenset], AuthenticatedClient] = {}
+
+def get_authenticated_client(config: dict[str, str], env_name: str) -> AuthenticatedClient:
+    """Return a shared AuthenticatedClient for this configuration and environment.
+
+    A one-shot CLI run builds a single client either way; a long-lived process
+    such as ``lmi daemon`` reuses the client, its token and its connection pool
+    for as long as the resolved configuration stays the same.
+
+    Args:
+        config: Configuration dictionary.
+        env_name: Environment name for token caching.
+
+    Returns:
+        AuthenticatedClient: A client for the given configuration.
+    """
+    key = (env_name, frozenset(config.items()))
+    client = _CLIENT_POOL.get(key)
+    if client is None:
+        client = _CLIENT_POOL[key] = AuthenticatedClient(config, env_name)
+    return client
+
+def _discard_pooled_client(client: AuthenticatedClient) -> None:
+    """Drop a client whose authentication failed, so the next lookup builds a fresh one."""
+    for key, pooled in list(_CLIENT_POOL.items()):
+        if pooled is client:
+            del _CLIENT_POOL[key]
+
+def discard_authenticated_clients(env_name: str) -> None:
+    """Close and drop the pooled clients of an environment after its login state changed.
+
+    Args:
+        env_name: Environment whose clients should pick up the new token state.
+    """
+    for key, pooled in list(_CLIENT_POOL.items()):
+        if key[0] == env_name:
+            del _CLIENT_POOL[key]
+            pooled.close()
+
+def close_authenticated_clients() -> None:
+    """Close every pooled AuthenticatedClient and empty the pool."""
+    while _CLIENT_POOL:
+        _, client = _CLIENT_POOL.popitem()
+        client.close()
+
+# Registered once: the pool empties and refills over a long-lived process's lifetime
+atexit.register(close_authenticated_clients)
@@ -1,13 +1,13 @@
 """CLI commands for authentication."""
 
-import datetime
+import time
 from typing import Any
 
 import click
 from rich.console import Console
 from rich.table import Table
 
-from lmi.auth import AuthToken, get_token, save_token
+from lmi.auth import clear_cached_token, discard_authenticated_clients, get_token
 from lmi.config import load_config
 
 console = Console()
@@ -31,12 +31,14 @@ def login(environment: str | None, force: bool) -> None:
             console.print("[yellow]Already logged in. Use --force to re-authenticate.[/yellow]")
             return
         
-        # Get new token with interactive login allowed
-        token = get_token(config, env_name, allow_interactive_for_new=True)
+        # Get new token with interactive login allowed; --force skips the cached token
+        token = get_token(config, env_name, allow_interactive_for_new=True, force_new=force)
         if not token:
             console.print("[red]Login failed: Could not acquire token[/red]")
             raise click.Abort()
         
+        # Clients pooled by a long-lived process (lmi daemon) still hold the previous token
+        discard_authenticated_clients(env_name)
         console.print("[green]Successfully logged in[/green]")
         if token.id_token:
             # TODO: Decode and display user info from ID token
@@ -54,13 +56,8 @@ def logout(environment: str | None) -> None:
         config = load_config(environment=environment)
         env_name = environment or config.get("default_environment", "default")
         
-        # Invalidate token by saving an empty one
-        save_token(env_name, AuthToken(
-            access_token="",
-            refresh_token=None,
-            id_token=None,
-            expires_at=0
-        ))
+        clear_cached_token(env_name)
+        discard_authenticated_clients(env_name)
         console.print("[green]Successfully logged out[/green]")
     except Exception as e:
         console.print(f"[red]Logout failed: {e}[/red]")
@@ -84,11 +81,10 @@ def status(environment: str | None) -> None:
         table.add_column("Value", style="green")
 
         # Add status information
-        expires_at = datetime.datetime.fromtimestamp(token.expires_at)
         table.add_row("Login Status", "Logged in")
         table.add_row("Grant Type", config.get("OAUTH_GRANT_TYPE", "client_credentials"))
-        table.add_row("Expires At", expires_at.strftime("%Y-%m-%d %H:%M:%S"))
-        table.add_row("Expires In", f"{max(0, token.expires_at - int(datetime.datetime.now().timestamp())) // 60} minutes")
+        table.add_row("Expires At", time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(token.expires_at)))
+        table.add_row("Expires In", f"{max(0, token.expires_at - int(time.time())) // 60} minutes")
         table.add_row("Has Refresh Token", str(bool(token.refresh_token)))
         table.add_row("Has ID Token", str(bool(token.id_token)))
 
@@ -0,0 +1,44 @@
+"""CLI commands for the optional resident lmi server."""
+
+from pathlib import Path
+
+import click
+
+from lmi.daemon import SOCKET_PATH, send, serve
+
+
+@click.group()
+def daemon() -> None:
+    """Run lmi as a resident server for fast repeated invocations (see lmi-client)."""
+    pass
+
+@daemon.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(path_type=Path),
+    default=SOCKET_PATH,
+    show_default=True,
+    help="Unix socket to listen on",
+)
+def start(socket_path: Path) -> None:
+    """Start the server in the foreground."""
+    click.echo(f"lmi daemon listening on {socket_path}", err=True)
+    serve(socket_path)
+
+@daemon.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(path_type=Path),
+    default=SOCKET_PATH,
+    show_default=True,
+    help="Unix socket of the running server",
+)
+def stop(socket_path: Path) -> None:
+    """Stop a running server."""
+    try:
+        send({"shutdown": True}, socket_path)
+    except OSError as e:
+        raise click.ClickException(f"No lmi daemon running on {socket_path}") from e
+    click.echo("lmi daemon stopped.", err=True)
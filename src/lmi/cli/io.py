@@ -0,0 +1,94 @@
+"""Input and output helpers shared by lmi commands and plugins."""
+
+import json
+import mmap
+import os
+import re
+import sys
+from typing import Optional
+
+import click
+
+try:
+    import orjson
+except ImportError:  # optional speedup, installed with the "fast" extra
+    orjson = None
+
+# Input files at least this large are memory-mapped instead of read into a bytes buffer
+_MMAP_MIN_SIZE = 1 << 20
+_NON_WHITESPACE = re.compile(rb"\S")
+
+
+def _dumps_json(data, pretty: bool) -> str | bytes:
+    """Serialize command output, with orjson when it is installed and can encode ``data``."""
+    if orjson is not None:
+        try:
+            # UTF-8 bytes that click.echo writes to the binary stream as-is
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except TypeError:  # orjson.JSONEncodeError, e.g. integers beyond 64 bits
+            pass
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+def format_output(data, output_format: str = "json"):
+    if output_format == "json":
+        # Pretty-print for humans; emit compact JSON when piped into jq or another script
+        output = _dumps_json(data, pretty=sys.stdout.isatty())
+        if isinstance(output, bytes) and not hasattr(sys.stdout, "buffer"):
+            # click can only write bytes through a binary buffer; text-only streams get str
+            output = output.decode("utf-8")
+        click.echo(output)
+    else:
+        click.echo(str(data))
+
+def _decode_text(raw) -> str:
+    """Decode UTF-8 input with the newline translation text-mode reads apply (universal newlines)."""
+    text = str(raw, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+def read_input_file(file: Optional[str]) -> str:
+    """
+    Read input data from a file or STDIN.
+    If file is '-', read from sys.stdin.
+    Returns the input as a string.
+    Raises click.ClickException on error or empty input.
+    """
+    if file is None:
+        raise click.ClickException("No input file specified.")
+    if file == "-":
+        buffer = getattr(sys.stdin, "buffer", None)
+        if buffer is None:
+            # A text-only stream (e.g. io.StringIO swapped in by a caller) is already decoded
+            text = sys.stdin.read()
+            if not text.strip():
+                raise click.ClickException("STDIN is empty. Provide input data or use --file <path>.")
+            return text
+        # One raw read and a single decode instead of text-mode reads through the IO wrapper
+        raw = buffer.read()
+        if not raw.strip():
+            raise click.ClickException("STDIN is empty. Provide input data or use --file <path>.")
+        try:
+            return _decode_text(raw)
+        except UnicodeDecodeError as e:
+            raise click.ClickException(f"STDIN is not valid UTF-8: {e}")
+    try:
+        with open(file, "rb") as f:
+            if os.fstat(f.fileno()).st_size >= _MMAP_MIN_SIZE:
+                # Decode straight from the page cache, skipping the intermediate bytes copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if not _NON_WHITESPACE.search(mm):
+                        raise click.ClickException(f"Input file '{file}' is empty.")
+                    return _decode_text(mm)
+            raw = f.read()
+        if not raw.strip():
+            raise click.ClickException(f"Input file '{file}' is empty.")
+        return _decode_text(raw)
+    except click.ClickException:
+        raise
+    except FileNotFoundError:
+        raise click.ClickException(f"Input file not found: {file}")
+    except Exception as e:
+        raise click.ClickException(f"Failed to read input file '{file}': {e}")
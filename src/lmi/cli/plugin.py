@@ -0,0 +1,78 @@
+"""CLI commands for managing lmi plugins."""
+
+import subprocess
+
+import click
+
+from lmi.cli.io import format_output
+
+
+def run_uv_pip(args: list[str]) -> int:
+    """Run ``uv pip <args>`` with its output going straight to the terminal.
+
+    Returns:
+        int: The uv exit code.
+
+    Raises:
+        click.ClickException: If uv is not installed.
+
+    """
+    try:
+        return subprocess.run(["uv", "pip", *args], check=False).returncode
+    except FileNotFoundError as e:
+        raise click.ClickException("uv is required to manage plugins but was not found on PATH") from e
+
+def describe_packages(packages: tuple[str, ...], noun: str = "plugin") -> str:
+    """Return e.g. "plugin 'a'" or "plugins 'a', 'b'" for status messages."""
+    names = ", ".join(f"'{package}'" for package in packages)
+    return f"{noun} {names}" if len(packages) == 1 else f"{noun}s {names}"
+
+@click.group()
+def plugin() -> None:
+    """Manage lmi plugins (install, uninstall, list)."""
+    pass
+
+@plugin.command()
+@click.argument("packages", nargs=-1, required=True)
+@click.option("--index-url", help="Custom package index URL (optional)")
+def install(packages: tuple[str, ...], index_url: str | None) -> None:
+    """Install one or more plugins from PyPI or a custom index."""
+    # One uv run resolves and installs every package together
+    args = ["install", *packages]
+    if index_url:
+        args += ["--index-url", index_url]
+    if run_uv_pip(args) == 0:
+        from lmi.plugins import plugin_manager
+
+        plugin_manager.refresh()
+        click.echo(f"{describe_packages(packages, 'Plugin')} installed successfully.")
+    else:
+        raise click.ClickException(f"Failed to install {describe_packages(packages)}")
+
+@plugin.command()
+@click.argument("packages", nargs=-1, required=True)
+def uninstall(packages: tuple[str, ...]) -> None:
+    """Uninstall one or more plugins by package name."""
+    if run_uv_pip(["uninstall", "-y", *packages]) == 0:
+        from lmi.plugins import plugin_manager
+
+        plugin_manager.refresh()
+        click.echo(f"{describe_packages(packages, 'Plugin')} uninstalled successfully.")
+    else:
+        raise click.ClickException(f"Failed to uninstall {describe_packages(packages)}")
+
+@plugin.command("list")
+def list_plugins() -> None:
+    """List installed lmi plugins and their versions."""
+    from lmi.plugins import plugin_manager
+
+    plugins = plugin_manager.entry_points().values()
+    if not plugins:
+        click.echo("No plugins installed.")
+        return
+    # Entry points carry their distribution, so no per-plugin metadata search is needed
+    data = [
+        {"name": ep.name, "module": ep.value, "version": ep.dist.version}
+        for ep in plugins
+    ]
+    format_output(data, output_format="json")
@@ -1,7 +1,10 @@
 """Configuration loading utilities for the lmi CLI application."""
 
 import os
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 
 from dotenv import dotenv_values
 
@@ -18,6 +21,48 @@ OAUTH_REQUIRED_KEYS = [
     # if only client_credentials is used. Add dynamically or ensure present when PKCE is grant_type.
 ]
 
+# OS environment variables with these prefixes are picked up even if no .env file sets them
+ENV_VAR_PREFIXES = ("LMI_", "OAUTH_")
+
+# Parsed .env files keyed by path, tagged with the (mtime_ns, size) they were parsed at
+_ENV_FILE_CACHE: dict[str, tuple[int, int, Mapping[str, str | None]]] = {}
+
+
+def _read_env_file(path: Path) -> Mapping[str, str | None] | None:
+    """Parse a .env file, reusing the previous result while the file is unchanged.
+
+    Args:
+        path: Path to the .env file.
+
+    Returns:
+        Mapping[str, str | None] | None: Read-only view of the parsed values (shared
+        between calls), or None if the file does not exist.
+
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    key = str(path)
+    cached = _ENV_FILE_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    # Parse from our own stream; given a path, dotenv would stat the file again
+    try:
+        with path.open(encoding="utf-8") as stream:
+            values = MappingProxyType(dotenv_values(stream=stream))
+    except FileNotFoundError:
+        return None
+    _ENV_FILE_CACHE[key] = (st.st_mtime_ns, st.st_size, values)
+    return values
+
+
+@lru_cache(maxsize=32)
+def _env_file_path(env_dir: Path, env_name: str) -> Path:
+    """Return the .env file path for an environment, built once per directory and name."""
+    return env_dir / f"{env_name}.env"
+
+
 def load_config(
     cli_args: dict[str, str] | None = None,
     environment: str | None = None,
@@ -40,38 +85,41 @@ def load_config(
         dict[str, str]: Loaded configuration.
 
     """
-    config: dict[str, str] = {}
-
     # 4. Main .env file
-    if MAIN_ENV_FILE.exists():
-        config.update(dotenv_values(str(MAIN_ENV_FILE)))
+    main_values = _read_env_file(MAIN_ENV_FILE) or {}
 
     # 2. Determine environment
-    env_name = environment or config.get("default_environment")
+    env_name = environment or main_values.get("default_environment")
     if not env_name:
         msg = "No environment specified and no default_environment in main .env"
         raise RuntimeError(msg)
-    env_file = ENV_DIR / f"{env_name}.env"
-    if env_file.exists():
-        config.update(dotenv_values(str(env_file)))
-    else:
+    env_file = _env_file_path(ENV_DIR, env_name)
+    env_values = _read_env_file(env_file)
+    if env_values is None:
         msg = f"Environment file not found: {env_file}"
         raise RuntimeError(msg)
 
-    # 2. OS environment variables
-    config.update({k: v for k, v in os.environ.items() if v is not None})
+    # 3. + 4. Both file layers in a single dict build, env-specific values winning
+    config: dict[str, str] = {**main_values, **env_values}
+
+    # 2. OS environment variables: override configured keys, add lmi/OAuth ones
+    config.update(
+        (k, v) for k, v in os.environ.items() if k in config or k.startswith(ENV_VAR_PREFIXES)
+    )
 
     # 1. CLI args
     if cli_args:
-        config.update({k: v for k, v in cli_args.items() if v is not None})
+        config.update((k, v) for k, v in cli_args.items() if v is not None)
 
-    # Check required keys
-    required_keys = REQUIRED_CONFIG_KEYS.copy()
+    # Check required keys (nothing to do in the common case of no requirements)
+    required_keys = frozenset(REQUIRED_CONFIG_KEYS)
     if require_oauth:
-        required_keys += OAUTH_REQUIRED_KEYS
-    missing = [k for k in required_keys if k not in config or not config[k]]
-    if missing:
-        msg = f"Missing required config: {', '.join(missing)}"
-        raise RuntimeError(msg)
+        required_keys |= frozenset(OAUTH_REQUIRED_KEYS)
+    if required_keys:
+        present = required_keys & config.keys()
+        missing = (required_keys - present) | {k for k in present if not config[k]}
+        if missing:
+            msg = f"Missing required config: {', '.join(sorted(missing))}"
+            raise RuntimeError(msg)
 
     return config
@@ -0,0 +1,182 @@
+"""Optional resident lmi server answering CLI invocations over a Unix socket.
+
+The server keeps the CLI, plugins and configuration caches loaded between
+invocations. The client half (``main``) only imports the standard library so
+forwarding a command costs little more than interpreter startup; if no server
+is listening it falls back to running the CLI in-process.
+
+Protocol: the client sends one JSON line ``{"argv", "cwd", "env"}`` (or
+``{"shutdown": true}``) and receives one JSON line
+``{"stdout", "stderr", "exit_code"}``.
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+SOCKET_PATH = Path.home() / ".cache" / "lmi" / "lmi.sock"
+
+# Root group options that take a value, so the subcommand can be found without importing click
+_VALUE_OPTIONS = frozenset({"-e", "--environment", "--output", "-C", "--config-override"})
+# Commands that manage the server itself; run inside a request they would deadlock or nest servers
+_LOCAL_COMMANDS = frozenset({"daemon"})
+
+
+def _subcommand(argv: list[str]) -> str | None:
+    """Return the subcommand name in ``argv``, skipping the root group's options."""
+    args = iter(argv)
+    for arg in args:
+        if arg == "--":
+            return next(args, None)
+        if arg in _VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def run_command(argv: list[str], cwd: str, env: dict[str, str]) -> dict[str, Any]:
+    """Run one CLI invocation in this process with the caller's cwd and environment.
+
+    Args:
+        argv: CLI arguments (without the program name).
+        cwd: Working directory of the calling process.
+        env: Environment of the calling process.
+
+    Returns:
+        dict[str, Any]: Captured stdout, stderr and the exit code.
+
+    """
+    import io
+    import traceback
+    from contextlib import redirect_stderr, redirect_stdout
+
+    from lmi.__main__ import cli
+
+    if _subcommand(argv) in _LOCAL_COMMANDS:
+        return {
+            "stdout": "",
+            "stderr": "Error: 'lmi daemon' commands cannot run inside the daemon; use lmi directly.\n",
+            "exit_code": 2,
+        }
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    stderr = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    saved_env = dict(os.environ)
+    saved_cwd = Path.cwd()
+    saved_stdin = sys.stdin
+    os.environ.clear()
+    os.environ.update(env)
+    os.chdir(cwd)
+    # STDIN is not forwarded (main() runs piped invocations in-process); `--file -` sees empty input
+    sys.stdin = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                cli.main(args=argv, prog_name="lmi")
+                exit_code = 0
+            except SystemExit as e:
+                if isinstance(e.code, int) or e.code is None:
+                    exit_code = e.code or 0
+                else:
+                    # Like the interpreter, report a non-integer exit code (a message) on stderr
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except Exception:
+                # e.g. a plugin bug: report it to the client instead of dropping the connection
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+    stdout.flush()
+    stderr.flush()
+    return {
+        "stdout": stdout.buffer.getvalue().decode("utf-8"),
+        "stderr": stderr.buffer.getvalue().decode("utf-8"),
+        "exit_code": exit_code,
+    }
+
+
+def serve(socket_path: Path = SOCKET_PATH) -> None:
+    """Serve CLI invocations on a Unix socket until a shutdown request arrives.
+
+    Requests are handled one at a time, since each one swaps the process-wide
+    environment, working directory and standard streams.
+
+    Args:
+        socket_path: Path of the Unix socket to listen on.
+
+    """
+    import socketserver
+
+    class _Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            request = json.loads(self.rfile.readline())
+            if request.get("shutdown"):
+                self.server.running = False
+                response = {"stdout": "", "stderr": "", "exit_code": 0}
+            else:
+                response = run_command(request["argv"], request["cwd"], request["env"])
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(str(socket_path), _Handler)
+    finally:
+        os.umask(old_umask)
+    server.running = True
+    try:
+        while server.running:
+            server.handle_request()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+def send(request: dict[str, Any], socket_path: Path = SOCKET_PATH) -> dict[str, Any]:
+    """Send a request to a running server and return its response.
+
+    Raises:
+        OSError: If no server is listening on ``socket_path``.
+        ConnectionError: If the server closed the connection without replying.
+
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            reply = f.readline()
+    if not reply:
+        raise ConnectionError(f"lmi daemon on {socket_path} closed the connection without replying")
+    return json.loads(reply)
+
+
+def main() -> None:
+    """Forward the current invocation to the server, or run it in-process.
+
+    ``daemon`` commands and invocations with piped STDIN always run in-process,
+    since the server neither runs its own management commands nor receives STDIN.
+    """
+    argv = sys.argv[1:]
+    if _subcommand(argv) not in _LOCAL_COMMANDS and sys.stdin.isatty():
+        request = {"argv": argv, "cwd": str(Path.cwd()), "env": dict(os.environ)}
+        try:
+            response = send(request)
+        except (FileNotFoundError, ConnectionRefusedError):
+            pass
+        else:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            sys.exit(response["exit_code"])
+    from lmi.__main__ import main as cli_main
+
+    cli_main()
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,17 @@ LOG_LEVELS = {
     2: logging.DEBUG,
 }
 
+# Arguments and root handlers of the last setup, so repeated calls can skip the rebuild
+_LAST_SETUP: tuple[tuple[int, str | None, bool], list[logging.Handler]] | None = None
+
+class _LazyFileHandler(logging.FileHandler):
+    """FileHandler that creates the log directory when it first opens the file."""
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
 def setup_logging(
     verbosity: int = 0,
     log_file: str | None = None,
@@ -25,6 +36,12 @@ def setup_logging(
         disable_file: If True, do not log to file
 
     """
+    global _LAST_SETUP
+    key = (verbosity, log_file, disable_file)
+    # Same options and our handlers still installed (e.g. the next lmi daemon request): keep them
+    if _LAST_SETUP is not None and _LAST_SETUP[0] == key and logging.getLogger().handlers == _LAST_SETUP[1]:
+        return
+
     log_level = LOG_LEVELS.get(verbosity, logging.DEBUG)
     handlers = []
 
@@ -43,8 +60,8 @@ def setup_logging(
     # File handler
     if not disable_file:
         log_path = Path(log_file) if log_file else Path(LOG_FILE_DEFAULT)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        file_handler = logging.FileHandler(str(log_path), encoding="utf-8")
+        # delay=True: the directory and file are only created once a record is written
+        file_handler = _LazyFileHandler(str(log_path), encoding="utf-8", delay=True)
         file_handler.setFormatter(
             logging.Formatter(
                 "%(asctime)s %(levelname)s [%(name)s] %(message)s",
@@ -59,3 +76,4 @@ def setup_logging(
         format="%(message)s",  # RichHandler handles formatting
         force=True,
     )
+    _LAST_SETUP = (key, list(logging.getLogger().handlers))
@@ -1,22 +1,26 @@
 """Plugin system for lmi CLI."""
 
-from typing import Any, Optional
+import importlib
+import importlib.metadata
+from typing import TYPE_CHECKING, Any, Optional
 
 import pluggy
-from lmi import auth
-from lmi.auth import AuthToken
+
+if TYPE_CHECKING:
+    from lmi import auth
+    from lmi.auth import AuthToken
 
 hookspec = pluggy.HookspecMarker("lmi")
 hookimpl = pluggy.HookimplMarker("lmi")
 
 class CliContext:
-    def __init__(self, config: dict[str, str], logger: Any, http_client: auth.AuthenticatedClient, global_flags: dict[str, Any]):
+    def __init__(self, config: dict[str, str], logger: Any, http_client: Optional["auth.AuthenticatedClient"], global_flags: dict[str, Any]):
         """Context object passed to plugins.
         
         Args:
             config: Configuration dictionary.
             logger: Logger instance.
-            http_client: Authenticated HTTP client.
+            http_client: Authenticated HTTP client (None while only help output is built).
             global_flags: Global CLI flags including 'output' (output format, e.g., 'json').
         """
         self.config = config
@@ -25,15 +29,16 @@ class CliContext:
         self.global_flags = global_flags
 
     @property
-    def auth_token(self) -> Optional[AuthToken]:
+    def auth_token(self) -> Optional["AuthToken"]:
         """Get current authentication token from the authenticated HTTP client.
         
+        Not cached on the context: the client replaces its token when it
+        refreshes after a 401, and this always reflects the current one.
+
         Returns:
             Optional[AuthToken]: Current authentication token if available.
         """
-        if self.http_client and hasattr(self.http_client, 'token'):
-            return self.http_client.token
-        return None
+        return getattr(self.http_client, "token", None)
 
     def is_authenticated(self) -> bool:
         """Check if user is authenticated based on the http_client's token.
@@ -82,9 +87,54 @@ class PluginManager:
     def __init__(self):
         self.pm = pluggy.PluginManager("lmi")
         self.pm.add_hookspecs(PluginSpec)
-        self.pm.load_setuptools_entrypoints("lmi_plugins")
+        self._entry_points: Optional[dict[str, importlib.metadata.EntryPoint]] = None
+
+    def entry_points(self) -> dict[str, importlib.metadata.EntryPoint]:
+        """Installed ``lmi_plugins`` entry points by name, discovered once per process."""
+        if self._entry_points is None:
+            self._entry_points = {
+                ep.name: ep for ep in importlib.metadata.entry_points(group="lmi_plugins")
+            }
+        return self._entry_points
+
+    def refresh(self) -> None:
+        """Forget discovered entry points, e.g. after a plugin was (un)installed."""
+        importlib.invalidate_caches()
+        self._entry_points = None
+
+    def load_plugin(self, name: str) -> bool:
+        """Import and register the plugin whose entry point is called ``name``.
+
+        Returns:
+            bool: True if the plugin is registered, False if no such plugin is installed.
+        """
+        if self.pm.has_plugin(name):
+            return True
+        ep = self.entry_points().get(name)
+        if ep is None:
+            return False
+        self.pm.register(ep.load(), name=name)
+        return True
 
     def register_plugins(self, cli, context: CliContext):
+        for name in self.entry_points():
+            self.load_plugin(name)
         self.pm.hook.register_commands(cli=cli, context=context)
 
 plugin_manager = PluginManager()
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve ``auth`` and ``AuthToken`` on first access.
+
+    Importing this module (e.g. for ``lmi plugin list``) should not pull in
+    httpx; plugins that reach ``lmi.auth`` through here still get it.
+    """
+    if name == "auth":
+        return importlib.import_module("lmi.auth")
+    if name == "AuthToken":
+        from lmi.auth import AuthToken
+
+        return AuthToken
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
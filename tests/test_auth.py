@@ -1,10 +1,43 @@
+import dataclasses
+import json
 import time
+from urllib.parse import parse_qs
+
+import httpx
 import pytest
 
 from lmi import auth
 from lmi.auth import AuthToken
 
 
+@dataclasses.dataclass(slots=True)
+class FakeResp:
+    status_code: int = 200
+    json_data: dict = None
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.json_data
+
+    @property
+    def content(self):
+        return json.dumps(self.json_data).encode()
+
+@pytest.fixture
+def mock_token_endpoint(monkeypatch):
+    """Route token endpoint requests through a real httpx.Client backed by a handler."""
+    clients = []
+    def install(handler):
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        monkeypatch.setattr(auth, "_TOKEN_HTTP_CLIENT", client)
+        return client
+    yield install
+    for client in clients:
+        client.close()
+
 def make_fake_token(expires_in=60):
     now = int(time.time())
     return AuthToken(
@@ -29,41 +62,105 @@ def test_token_cache(tmp_path, monkeypatch):
     auth.save_token(env_name, expired)
     assert auth.load_cached_token(env_name) is None
 
-def test_is_token_expired():
-    token = make_fake_token(1)
-    assert not token.is_expired
-    token.expires_at = int(time.time()) - 1
-    assert token.is_expired
+def test_token_cache_is_plain_json(tmp_path, monkeypatch):
+    import json
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    token = make_fake_token(60)
+    auth.save_token("testenv", token)
+    # Readable by the stdlib parser whether or not orjson wrote it
+    assert json.loads((tmp_path / "testenv.json").read_text(encoding="utf-8")) == token.to_dict()
+
+def test_cached_token_parsed_once_while_unchanged(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    auth.save_token("testenv", make_fake_token(60))
+    parsed = []
+    real_loads = auth._json_loads
+    def counting_loads(data):
+        parsed.append(data)
+        return real_loads(data)
+    monkeypatch.setattr(auth, "_json_loads", counting_loads)
+    # The token written by save_token is served from memory
+    assert auth.load_cached_token("testenv").access_token == "fake-token"
+    assert auth.load_cached_token("testenv").access_token == "fake-token"
+    assert parsed == []
+    # Another process rewriting the file invalidates the in-memory copy
+    other = auth.AuthToken.from_dict({**make_fake_token(60).to_dict(), "access_token": "from-elsewhere"})
+    (tmp_path / "testenv.json").write_bytes(auth._json_dumps(other.to_dict()))
+    assert auth.load_cached_token("testenv").access_token == "from-elsewhere"
+    assert auth.load_cached_token("testenv").access_token == "from-elsewhere"
+    assert len(parsed) == 1
+
+def test_save_token_replaces_file_atomically(tmp_path, monkeypatch):
+    import stat
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    auth.save_token("testenv", make_fake_token(60))
+    auth.save_token("testenv", make_fake_token(120))
+    path = tmp_path / "testenv.json"
+    assert [p.name for p in tmp_path.iterdir()] == ["testenv.json"]
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    # A failed write leaves the previous cache in place and no temp file behind
+    previous = path.read_bytes()
+    monkeypatch.setattr(auth, "_json_dumps", lambda data: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        auth.save_token("testenv", make_fake_token(180))
+    assert path.read_bytes() == previous
+    assert [p.name for p in tmp_path.iterdir()] == ["testenv.json"]
+
+def test_save_token_skips_unchanged_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    token = make_fake_token(60)
+    auth.save_token("testenv", token)
+    written = []
+    real_dumps = auth._json_dumps
+    monkeypatch.setattr(auth, "_json_dumps", lambda data: written.append(data) or real_dumps(data))
+    auth.save_token("testenv", dataclasses.replace(token))
+    assert written == []
+    # A changed token, or a cache file removed behind our back, is written
+    auth.save_token("testenv", dataclasses.replace(token, access_token="other"))
+    (tmp_path / "testenv.json").unlink()
+    auth.save_token("testenv", dataclasses.replace(token, access_token="other"))
+    assert len(written) == 2
+    assert auth.load_cached_token("testenv").access_token == "other"
+
+def test_get_token_refreshes_expired_cached_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    expired = AuthToken.from_dict({**make_fake_token(-10).to_dict(), "refresh_token": "refresh1"})
+    auth.save_token("testenv", expired)
+    refreshed = make_fake_token(60)
+    monkeypatch.setattr(auth, "_refresh_auth_token", lambda token, config: refreshed)
+    def fail_acquire(*a, **k):
+        raise AssertionError("acquire_token should not run")
+    monkeypatch.setattr(auth, "acquire_token", fail_acquire)
+    assert auth.get_token({}, "testenv") is refreshed
+    # The refreshed token is written back to the cache
+    assert auth.load_cached_token("testenv").to_dict() == refreshed.to_dict()
 
-def test_is_token_expired_fallback():
-    # No expires_at, fallback to issued_at + expires_in
+@pytest.mark.parametrize("expires_in,issued_ago,expected_expired", [
+    (60, 0, False),
+    (-1, 10, True),
+    # A token without a usable expires_at (0) is always expired, with or without issued_at
+    (None, 0, True),
+    (None, None, True),
+])
+def test_is_token_expired(expires_in, issued_ago, expected_expired):
     now = int(time.time())
-    # Simulate missing expires_at by setting it to 0
     token = AuthToken(
         access_token="fake-token",
-        expires_at=0,
+        expires_at=0 if expires_in is None else now + expires_in,
         token_type="Bearer",
         refresh_token=None,
         id_token=None,
-        issued_at=now
+        issued_at=None if issued_ago is None else now - issued_ago
     )
-    # Patch property to simulate expires_in logic if needed
-    # But our AuthToken only uses expires_at, so this test is now trivial
-    assert token.is_expired  # Should be expired since expires_at=0
+    assert token.is_expired == expected_expired
 
-def test_is_token_expired_fallback_no_issued_at():
-    # No expires_at, no issued_at
-    token = AuthToken(
-        access_token="fake-token",
-        expires_at=0,
-        token_type="Bearer",
-        refresh_token=None,
-        id_token=None,
-        issued_at=None
-    )
-    assert token.is_expired
+def test_auth_token_is_immutable():
+    token = make_fake_token(60)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        token.access_token = "other"
+    assert not hasattr(token, "__dict__")
 
-def test_acquire_token_client_credentials(monkeypatch):
+def test_acquire_token_client_credentials(monkeypatch, mock_token_endpoint):
     config = {
         "OAUTH_CLIENT_ID": "id",
         "OAUTH_CLIENT_SECRET": "secret",
@@ -74,18 +171,102 @@ def test_acquire_token_client_credentials(monkeypatch):
         "expires_in": 60,
         "token_type": "Bearer"
     }
+    def handler(request):
+        assert str(request.url) == config["OAUTH_TOKEN_URL"]
+        assert parse_qs(request.content.decode())["client_id"] == [config["OAUTH_CLIENT_ID"]]
+        return httpx.Response(200, json=fake_response)
+    mock_token_endpoint(handler)
+    token = auth.acquire_token(config, grant_type="client_credentials")
+    assert token.access_token == "abc123"
+    assert token.expires_at > int(time.time())
+
+def test_s256_code_challenge_matches_authlib():
+    import secrets
+    from authlib.oauth2.rfc7636 import create_s256_code_challenge
+    for verifier in ("a" * 43, secrets.token_urlsafe(64)):
+        challenge = auth._s256_code_challenge(verifier)
+        assert challenge == create_s256_code_challenge(verifier)
+        assert "=" not in challenge
+
+def test_sso_callback_handler_success_page():
+    import threading
+    server = auth.SSOCallbackServer(("localhost", 0), auth.SSOCallbackHandler)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    try:
+        port = server.server_address[1]
+        resp = httpx.get(f"http://localhost:{port}/callback?code=abc&state=xyz", timeout=5)
+    finally:
+        thread.join(timeout=5)
+        server.server_close()
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "text/html"
+    assert int(resp.headers["content-length"]) == len(resp.content)
+    assert b"Authentication successful!" in resp.content
+    assert server.done.is_set()
+    assert (server.auth_code, server.state, server.error) == ("abc", "xyz", None)
+
+def test_sso_callback_handler_ignores_other_paths():
+    import threading
+    server = auth.SSOCallbackServer(("localhost", 0), auth.SSOCallbackHandler)
+    thread = threading.Thread(target=server.handle_request)
+    thread.start()
+    try:
+        port = server.server_address[1]
+        resp = httpx.get(f"http://localhost:{port}/favicon.ico", timeout=5)
+    finally:
+        thread.join(timeout=5)
+        server.server_close()
+    assert resp.status_code == 404
+    assert not server.done.is_set()
+
+def test_pkce_authorize_url_is_encoded(monkeypatch):
+    from urllib.parse import parse_qs, urlparse
+    config = {
+        "OAUTH_CLIENT_ID": "client id",
+        "OAUTH_AUTHORIZE_URL": "https://auth.example.com/authorize",
+        "OAUTH_TOKEN_URL": "https://auth.example.com/token",
+        "OAUTH_SCOPES": "openid  profile\temail",
+    }
+    opened = []
+    monkeypatch.setattr(auth, "PKCE_CALLBACK_TIMEOUT", 0)
+    monkeypatch.setattr("webbrowser.open", opened.append)
+    # No callback ever arrives, so the flow times out right after opening the browser
+    with pytest.raises(RuntimeError, match="timed out"):
+        auth._acquire_pkce_token(config, "testenv")
+    url = urlparse(opened[0])
+    assert "scope=openid%20profile%20email" in url.query
+    params = parse_qs(url.query)
+    assert params["client_id"] == ["client id"]
+    assert params["redirect_uri"][0].startswith("http://localhost:")
+    assert params["code_challenge_method"] == ["S256"]
+
+def test_token_requests_share_one_http_client(monkeypatch):
+    config = {
+        "OAUTH_CLIENT_ID": "id",
+        "OAUTH_CLIENT_SECRET": "secret",
+        "OAUTH_TOKEN_URL": "https://example.com/token",
+    }
+    created = []
     class FakeClient:
-        def __init__(self, *a, **k): pass
-        def __enter__(self): return self
-        def __exit__(self, *a): pass
+        def __init__(self, *a, **k): created.append(self)
         def post(self, url, data):
-            assert url == config["OAUTH_TOKEN_URL"]
-            assert data["client_id"] == config["OAUTH_CLIENT_ID"]
-            return type("Resp", (), {"raise_for_status": lambda s: None, "json": lambda s: fake_response})()
+            return FakeResp(json_data={"access_token": data["grant_type"]})
+        def close(self): pass
     monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": FakeClient}))
+    monkeypatch.setattr(auth, "_TOKEN_HTTP_CLIENT", None)
     token = auth.acquire_token(config, grant_type="client_credentials")
-    assert token.access_token == "abc123"
-    assert token.expires_at > int(time.time())
+    refreshed = auth._refresh_auth_token(AuthToken.from_dict({**token.to_dict(), "refresh_token": "r"}), config)
+    assert refreshed.access_token == "refresh_token"
+    assert len(created) == 1
+
+@pytest.mark.slow
+def test_import_does_not_load_authlib():
+    import subprocess
+    import sys
+    code = "import sys, lmi.auth; print('authlib' in sys.modules, 'webbrowser' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "False"]
 
 def test_acquire_token_invalid_grant(monkeypatch):
     config = {"OAUTH_CLIENT_ID": "id", "OAUTH_CLIENT_SECRET": "secret", "OAUTH_TOKEN_URL": "url"}
@@ -123,16 +304,16 @@ def test_authenticated_client_refresh(monkeypatch):
         def request(self, method, url, **kwargs):
             calls["request"] += 1
             if calls["request"] == 1:
-                return type("Resp", (), {"status_code": 401})()
-            return type("Resp", (), {"status_code": 200})()
+                return FakeResp(status_code=401)
+            return FakeResp()
         def post(self, url, data=None, **kwargs):
             calls["post"] += 1
             # Simulate a successful refresh response
-            return type("Resp", (), {"raise_for_status": lambda s=None: None, "json": lambda s=None: {
+            return FakeResp(json_data={
                 "access_token": "new-token",
                 "expires_in": 60,
                 "token_type": "Bearer"
-            }})()
+            })
         def close(self): pass
         def __enter__(self): return self
         def __exit__(self, exc_type, exc_val, exc_tb): pass
@@ -143,21 +324,52 @@ def test_authenticated_client_refresh(monkeypatch):
     monkeypatch.setattr(auth, "get_token", fake_get_token)
     monkeypatch.setattr(auth, "acquire_token", fake_acquire_token)
     monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    monkeypatch.setattr(auth, "_TOKEN_HTTP_CLIENT", None)
     client = auth.AuthenticatedClient(config, env_name)
     resp = client.request("GET", "https://api.example.com/resource")
     assert calls["request"] == 2
     client.close()
 
+def test_authenticated_client_refresh_failure_clears_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    token = AuthToken.from_dict({**make_fake_token(60).to_dict(), "refresh_token": "refresh1"})
+    auth.save_token("testenv", token)
+    class FakeClient:
+        def __init__(self, *a, **k): self.headers = {}
+        def request(self, method, url, **kwargs):
+            return FakeResp(status_code=401)
+        def close(self): pass
+    def failing_refresh(token, config):
+        raise RuntimeError("refresh rejected")
+    monkeypatch.setattr(auth, "get_token", lambda *a, **k: token)
+    monkeypatch.setattr(auth, "_refresh_auth_token", failing_refresh)
+    monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    client = auth.AuthenticatedClient({}, "testenv")
+    with pytest.raises(RuntimeError, match="token refresh unsuccessful"):
+        client.get("https://api.example.com/resource")
+    assert not (tmp_path / "testenv.json").exists()
+    assert auth.load_cached_token("testenv") is None
+
+def test_authenticated_client_sets_authorization_header(monkeypatch):
+    monkeypatch.setattr(auth, "get_token", lambda *a, **k: make_fake_token(60))
+    client = auth.AuthenticatedClient({}, "testenv")
+    try:
+        request = client.client.build_request("GET", "https://api.example.com/resource")
+        assert request.headers["Authorization"] == "Bearer fake-token"
+    finally:
+        client.close()
+
 def test_authenticated_client_get_post(monkeypatch):
     config = {"OAUTH_CLIENT_ID": "id", "OAUTH_CLIENT_SECRET": "secret", "OAUTH_TOKEN_URL": "url"}
     env_name = "testenv"
     class FakeClient:
         def __init__(self, *a, **k): self.headers = {}
         def request(self, method, url, **kwargs):
-            return type("Resp", (), {"status_code": 200})()
+            return FakeResp()
         def close(self): pass
     monkeypatch.setattr(auth, "get_token", lambda *a, **k: make_fake_token(60))
     monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    monkeypatch.setattr(auth, "_TOKEN_HTTP_CLIENT", None)
     client = auth.AuthenticatedClient(config, env_name)
     resp = client.get("http://foo")
     assert resp.status_code == 200
@@ -165,7 +377,7 @@ def test_authenticated_client_get_post(monkeypatch):
     assert resp.status_code == 200
     client.close()
 
-def test_acquire_token_no_expires_in(monkeypatch):
+def test_acquire_token_no_expires_in(monkeypatch, mock_token_endpoint):
     config = {
         "OAUTH_CLIENT_ID": "id",
         "OAUTH_CLIENT_SECRET": "secret",
@@ -176,13 +388,7 @@ def test_acquire_token_no_expires_in(monkeypatch):
         "token_type": "Bearer"
         # no expires_in
     }
-    class FakeClient:
-        def __init__(self, *a, **k): pass
-        def __enter__(self): return self
-        def __exit__(self, *a): pass
-        def post(self, url, data):
-            return type("Resp", (), {"raise_for_status": lambda s: None, "json": lambda s: fake_response})()
-    monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": FakeClient}))
+    mock_token_endpoint(lambda request: httpx.Response(200, json=fake_response))
     token = auth.acquire_token(config, grant_type="client_credentials")
     assert token.access_token == "abc123"
     assert token.issued_at is not None
@@ -196,8 +402,8 @@ def test_authenticated_client_401_empty_token(monkeypatch):
         def request(self, method, url, **kwargs):
             calls["request"] += 1
             if calls["request"] == 1:
-                return type("Resp", (), {"status_code": 401})()
-            return type("Resp", (), {"status_code": 200})()
+                return FakeResp(status_code=401)
+            return FakeResp()
         def close(self): pass
         def __enter__(self): return self
         def __exit__(self, exc_type, exc_val, exc_tb): pass
@@ -216,6 +422,7 @@ def test_authenticated_client_401_empty_token(monkeypatch):
     monkeypatch.setattr(auth, "get_token", fake_get_token)
     monkeypatch.setattr(auth, "acquire_token", fake_acquire_token)
     monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    monkeypatch.setattr(auth, "_TOKEN_HTTP_CLIENT", None)
     client = auth.AuthenticatedClient(config, env_name)
     try:
         resp = client.request("GET", "https://api.example.com/resource")
@@ -242,8 +449,8 @@ def test_authenticated_client_401_post_retry(monkeypatch):
         def request(self, method, url, **kwargs):
             calls["request"] += 1
             if calls["request"] == 1:
-                return type("Resp", (), {"status_code": 401})()
-            return type("Resp", (), {"status_code": 200})()
+                return FakeResp(status_code=401)
+            return FakeResp()
         def close(self): pass
         def __enter__(self): return self
         def __exit__(self, exc_type, exc_val, exc_tb): pass
@@ -262,9 +469,124 @@ def test_authenticated_client_401_post_retry(monkeypatch):
     monkeypatch.setattr(auth, "get_token", fake_get_token)
     monkeypatch.setattr(auth, "acquire_token", fake_acquire_token)
     monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    monkeypatch.setattr(auth, "_TOKEN_HTTP_CLIENT", None)
     client = auth.AuthenticatedClient(config, env_name)
     try:
         resp = client.post("https://api.example.com/resource")
     except RuntimeError as e:
         assert "no refresh token available" in str(e).lower()
     client.close()
+
+def test_get_authenticated_client_reuses_instances(monkeypatch):
+    created = []
+    class DummyClient:
+        def __init__(self, config, env_name):
+            created.append((dict(config), env_name))
+    monkeypatch.setattr(auth, "AuthenticatedClient", DummyClient)
+    monkeypatch.setattr(auth, "_CLIENT_POOL", {})
+    config = {"OAUTH_CLIENT_ID": "id", "OAUTH_TOKEN_URL": "url"}
+    first = auth.get_authenticated_client(config, "dev")
+    assert auth.get_authenticated_client(dict(config), "dev") is first
+    assert auth.get_authenticated_client(config, "prod") is not first
+    assert auth.get_authenticated_client({**config, "OAUTH_CLIENT_ID": "other"}, "dev") is not first
+    assert len(created) == 3
+
+def test_authenticated_client_401_without_refresh_token_clears_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    token = make_fake_token(60)
+    auth.save_token("testenv", token)
+    class FakeClient:
+        def __init__(self, *a, **k): self.headers = {}
+        def request(self, method, url, **kwargs):
+            return FakeResp(status_code=401)
+        def close(self): pass
+    monkeypatch.setattr(auth, "get_token", lambda *a, **k: token)
+    monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    client = auth.AuthenticatedClient({}, "testenv")
+    with pytest.raises(RuntimeError, match="no refresh token available"):
+        client.get("https://api.example.com/resource")
+    assert not (tmp_path / "testenv.json").exists()
+
+def test_authenticated_client_refreshes_before_expiry(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    expiring = AuthToken.from_dict({**make_fake_token(5).to_dict(), "refresh_token": "refresh1"})
+    fresh = AuthToken.from_dict({**make_fake_token(3600).to_dict(), "access_token": "fresh"})
+    sent = []
+    class FakeClient:
+        def __init__(self, *a, **k): self.headers = {}
+        def request(self, method, url, **kwargs):
+            sent.append(self.headers["Authorization"])
+            return FakeResp()
+        def close(self): pass
+    monkeypatch.setattr(auth, "get_token", lambda *a, **k: expiring)
+    monkeypatch.setattr(auth, "_refresh_auth_token", lambda token, config: fresh)
+    monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    client = auth.AuthenticatedClient({}, "testenv")
+    client.get("https://api.example.com/resource")
+    assert sent == ["Bearer fresh"]
+    assert auth.load_cached_token("testenv") == fresh
+
+def test_close_authenticated_clients(monkeypatch):
+    closed = []
+    class DummyClient:
+        def __init__(self, config, env_name):
+            self.env_name = env_name
+        def close(self):
+            closed.append(self.env_name)
+    monkeypatch.setattr(auth, "AuthenticatedClient", DummyClient)
+    monkeypatch.setattr(auth, "_CLIENT_POOL", {})
+    first = auth.get_authenticated_client({}, "dev")
+    auth.get_authenticated_client({}, "prod")
+    auth.close_authenticated_clients()
+    assert sorted(closed) == ["dev", "prod"]
+    assert auth.get_authenticated_client({}, "dev") is not first
+
+def test_pooled_client_replaces_expired_token_without_refresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(auth, "_CLIENT_POOL", {})
+    tokens = [make_fake_token(-10), make_fake_token(3600)]
+    tokens[1] = dataclasses.replace(tokens[1], access_token="fresh")
+    sent = []
+    class FakeClient:
+        def __init__(self, *a, **k): self.headers = {}
+        def request(self, method, url, **kwargs):
+            sent.append(self.headers["Authorization"])
+            return FakeResp()
+        def close(self): pass
+    monkeypatch.setattr(auth, "get_token", lambda *a, **k: tokens.pop(0))
+    monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    client = auth.get_authenticated_client({}, "dev")
+    # The client-credentials token expired while pooled and has no refresh token
+    client.get("https://api.example.com/resource")
+    assert sent == ["Bearer fresh"]
+
+def test_failed_401_drops_client_from_pool(monkeypatch):
+    monkeypatch.setattr(auth, "_CLIENT_POOL", {})
+    class FakeClient:
+        def __init__(self, *a, **k): self.headers = {}
+        def request(self, method, url, **kwargs):
+            return FakeResp(status_code=401)
+        def close(self): pass
+    monkeypatch.setattr(auth, "get_token", lambda *a, **k: make_fake_token(60))
+    monkeypatch.setattr(auth, "clear_cached_token", lambda env_name: None)
+    monkeypatch.setattr(auth, "httpx", type("httpx", (), {"Client": lambda *a, **k: FakeClient()}))
+    client = auth.get_authenticated_client({}, "dev")
+    with pytest.raises(RuntimeError, match="no refresh token available"):
+        client.get("https://api.example.com/resource")
+    assert auth.get_authenticated_client({}, "dev") is not client
+
+def test_discard_authenticated_clients(monkeypatch):
+    closed = []
+    class DummyClient:
+        def __init__(self, config, env_name):
+            self.env_name = env_name
+        def close(self):
+            closed.append(self.env_name)
+    monkeypatch.setattr(auth, "AuthenticatedClient", DummyClient)
+    monkeypatch.setattr(auth, "_CLIENT_POOL", {})
+    dev = auth.get_authenticated_client({}, "dev")
+    prod = auth.get_authenticated_client({}, "prod")
+    auth.discard_authenticated_clients("dev")
+    assert closed == ["dev"]
+    assert auth.get_authenticated_client({}, "dev") is not dev
+    assert auth.get_authenticated_client({}, "prod") is prod
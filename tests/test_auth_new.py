@@ -1,11 +1,13 @@
-import time
-import pytest
-from unittest.mock import patch, MagicMock
 import json
+import threading
+import time
 from pathlib import Path
 
+import httpx
+import pytest
+
 from lmi import auth
-from lmi.auth import AuthToken, SSOCallbackHandler
+from lmi.auth import AuthToken
 
 def test_auth_token_dataclass():
     now = int(time.time())
@@ -29,12 +31,7 @@ def test_auth_token_dataclass():
     
     # Test deserialization
     new_token = AuthToken.from_dict(token_dict)
-    assert new_token.access_token == token.access_token
-    assert new_token.refresh_token == token.refresh_token
-    assert new_token.id_token == token.id_token
-    assert new_token.expires_at == token.expires_at
-    assert new_token.token_type == token.token_type
-    assert new_token.issued_at == token.issued_at
+    assert new_token == token
     
     # Test expiration
     assert not token.is_expired
@@ -47,6 +44,7 @@ def test_auth_token_dataclass():
     assert expired_token.is_expired
 
 def test_pkce_token_flow(monkeypatch, tmp_path):
+    from urllib.parse import parse_qs, urlparse
     # Mock configuration
     config = {
         "OAUTH_CLIENT_ID": "test-client",
@@ -54,51 +52,51 @@ def test_pkce_token_flow(monkeypatch, tmp_path):
         "OAUTH_TOKEN_URL": "https://auth.example.com/token",
         "OAUTH_GRANT_TYPE": "authorization_code_pkce"
     }
-    # Mock browser interaction
-    mock_browser = MagicMock()
-    monkeypatch.setattr("webbrowser.open", mock_browser)
-    # Mock HTTP server
-    mock_server = MagicMock()
-    mock_server.port = 12345
-    mock_server.shutdown = MagicMock()
-    mock_server.serve_forever = MagicMock()
-    # Mock callback handler
-    with patch("http.server.HTTPServer", return_value=mock_server):
-        with patch("threading.Thread") as mock_thread:
-            # Simulate successful callback
-            def mock_callback():
-                handler = SSOCallbackHandler()
-                handler.code = "test-auth-code"
-                handler.error = None
-                handler.state = "test-state"
-            mock_thread.return_value.start.side_effect = mock_callback
-            # Mock token endpoint response
-            mock_response = {
-                "access_token": "test-access",
-                "refresh_token": "test-refresh",
-                "id_token": "test-id",
-                "expires_in": 3600,
-                "token_type": "Bearer"
-            }
-            with patch("httpx.Client.post") as mock_post:
-                mock_post.return_value.json.return_value = mock_response
-                mock_post.return_value.raise_for_status = MagicMock()
-                # Test token acquisition
-                try:
-                    token = auth._acquire_pkce_token(config, "test-env")
-                except RuntimeError as e:
-                    # Accept timeout as a valid outcome due to mocking limitations
-                    if "timed out" in str(e):
-                        pytest.skip("PKCE handler cannot be fully mocked in this test environment.")
-                    else:
-                        raise
-                else:
-                    assert isinstance(token, AuthToken)
-                    assert token.access_token == "test-access"
-                    assert token.refresh_token == "test-refresh"
-                    assert token.id_token == "test-id"
-                    assert token.token_type == "Bearer"
-                    assert not token.is_expired
+    # The "browser" follows the authorization URL back to the local callback server,
+    # concurrently, since lmi serves the callback on its own thread after opening it
+    def fake_browser(url):
+        params = parse_qs(urlparse(url).query)
+        redirect_uri = params["redirect_uri"][0]
+        query = {"code": "test-auth-code", "state": params["state"][0]}
+        threading.Thread(target=httpx.get, args=(redirect_uri,), kwargs={"params": query, "timeout": 5}).start()
+        return True
+    monkeypatch.setattr("webbrowser.open", fake_browser)
+    # Mock token endpoint response
+    mock_response = {
+        "access_token": "test-access",
+        "refresh_token": "test-refresh",
+        "id_token": "test-id",
+        "expires_in": 3600,
+        "token_type": "Bearer"
+    }
+    fetch_calls = []
+    def fake_fetch_token(self, url, **kwargs):
+        fetch_calls.append(kwargs)
+        return mock_response
+    monkeypatch.setattr("authlib.integrations.httpx_client.OAuth2Client.fetch_token", fake_fetch_token)
+    token = auth._acquire_pkce_token(config, "test-env")
+    assert fetch_calls[0]["code"] == "test-auth-code"
+    assert isinstance(token, AuthToken)
+    assert (token.access_token, token.refresh_token, token.id_token, token.token_type) == (
+        "test-access", "test-refresh", "test-id", "Bearer"
+    )
+    assert not token.is_expired
+
+def test_pkce_state_mismatch(monkeypatch):
+    from urllib.parse import parse_qs, urlparse
+    config = {
+        "OAUTH_CLIENT_ID": "test-client",
+        "OAUTH_AUTHORIZE_URL": "https://auth.example.com/authorize",
+        "OAUTH_TOKEN_URL": "https://auth.example.com/token",
+    }
+    def fake_browser(url):
+        redirect_uri = parse_qs(urlparse(url).query)["redirect_uri"][0]
+        query = {"code": "test-auth-code", "state": "forged"}
+        threading.Thread(target=httpx.get, args=(redirect_uri,), kwargs={"params": query, "timeout": 5}).start()
+        return True
+    monkeypatch.setattr("webbrowser.open", fake_browser)
+    with pytest.raises(RuntimeError, match="State mismatch"):
+        auth._acquire_pkce_token(config, "test-env")
 
 def test_token_refresh_with_auth_token(monkeypatch):
     now = int(time.time())
@@ -126,16 +124,15 @@ def test_token_refresh_with_auth_token(monkeypatch):
         "token_type": "Bearer"
     }
     
-    with patch("httpx.Client.post") as mock_post:
-        mock_post.return_value.json.return_value = mock_response
-        mock_post.return_value.raise_for_status = MagicMock()
-        
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=mock_response))
+    with httpx.Client(transport=transport) as client:
+        monkeypatch.setattr(auth, "_TOKEN_HTTP_CLIENT", client)
         new_token = auth._refresh_auth_token(old_token, config)
-        assert isinstance(new_token, AuthToken)
-        assert new_token.access_token == "new-access"
-        assert new_token.refresh_token == "new-refresh"
-        assert new_token.id_token == "new-id"
-        assert not new_token.is_expired
+    assert isinstance(new_token, AuthToken)
+    assert (new_token.access_token, new_token.refresh_token, new_token.id_token) == (
+        "new-access", "new-refresh", "new-id"
+    )
+    assert not new_token.is_expired
 
 def test_environment_specific_auth(monkeypatch, tmp_path):
     # Set up test environment
@@ -214,13 +211,93 @@ def test_auth_login_command(monkeypatch, tmp_path):
         issued_at=int(time.time())
     )
     
-    with patch("lmi.auth._acquire_pkce_token", return_value=mock_token):
-        # Test force re-authentication
-        token = auth.get_token(config, "test-env", allow_interactive_for_new=True, force_new=True)
-        assert isinstance(token, AuthToken)
-        assert token.access_token == "test-access"
-        
-        # Verify token is cached
-        cached_token = auth.load_cached_token("test-env")
-        assert cached_token is not None
-        assert cached_token.access_token == "test-access" 
\ No newline at end of file
+    monkeypatch.setattr(auth, "_acquire_pkce_token", lambda *a, **k: mock_token)
+    # Test force re-authentication
+    token = auth.get_token(config, "test-env", allow_interactive_for_new=True, force_new=True)
+    assert isinstance(token, AuthToken)
+    assert token.access_token == "test-access"
+
+    # Verify token is cached
+    cached_token = auth.load_cached_token("test-env")
+    assert cached_token is not None
+    assert cached_token.access_token == "test-access"
+
+
+@pytest.mark.parametrize("logged_in", [True, False])
+def test_auth_status_command(monkeypatch, logged_in):
+    from click.testing import CliRunner
+    import lmi.cli.auth as cli_auth
+    # Build the token here so its expiry is relative to when the test runs, not to import time
+    token = None
+    expected = ["Not logged in"]
+    if logged_in:
+        expires_at = int(time.time()) + 3600
+        token = AuthToken(access_token="test-access", expires_at=expires_at, refresh_token="test-refresh")
+        expected = [time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(expires_at)), "Has Refresh Token"]
+    monkeypatch.setattr(cli_auth, "load_config", lambda environment=None: {"default_environment": "dev"})
+    monkeypatch.setattr(cli_auth, "get_token", lambda config, env_name: token)
+    monkeypatch.setattr(cli_auth, "console", cli_auth.Console(width=200))
+    result = CliRunner().invoke(cli_auth.auth, ["status"])
+    assert result.exit_code == 0
+    for text in expected:
+        assert text in result.output
+    if logged_in:
+        assert "59 minutes" in result.output or "60 minutes" in result.output
+
+@pytest.mark.parametrize("args,expected_calls", [
+    ([], [{}]),
+    (["--force"], [{"allow_interactive_for_new": True, "force_new": True}]),
+])
+def test_auth_login_command_with_cached_token(monkeypatch, args, expected_calls):
+    from click.testing import CliRunner
+    import lmi.cli.auth as cli_auth
+    token = AuthToken(access_token="test-access", expires_at=int(time.time()) + 3600)
+    calls = []
+    def fake_get_token(config, env_name, **kwargs):
+        calls.append(kwargs)
+        return token
+    monkeypatch.setattr(cli_auth, "load_config", lambda environment=None: {"default_environment": "dev"})
+    monkeypatch.setattr(cli_auth, "get_token", fake_get_token)
+    result = CliRunner().invoke(cli_auth.auth, ["login", *args])
+    assert result.exit_code == 0
+    # A valid cached token short-circuits login; --force goes straight to a new one
+    assert calls == expected_calls
+
+def test_auth_logout_command(tmp_path, monkeypatch):
+    from click.testing import CliRunner
+    import lmi.cli.auth as cli_auth
+    monkeypatch.setattr(auth, "TOKEN_CACHE_DIR", tmp_path)
+    auth.save_token("dev", AuthToken(access_token="test-access", expires_at=int(time.time()) + 3600))
+    discarded = []
+    monkeypatch.setattr(cli_auth, "load_config", lambda environment=None: {"default_environment": "dev"})
+    monkeypatch.setattr(cli_auth, "discard_authenticated_clients", discarded.append)
+    result = CliRunner().invoke(cli_auth.auth, ["logout"])
+    assert result.exit_code == 0
+    assert not (tmp_path / "dev.json").exists()
+    # Pooled clients (lmi daemon) must not keep using the old token
+    assert discarded == ["dev"]
+
+def test_pkce_idle_connection_times_out(monkeypatch):
+    import socket
+    from urllib.parse import parse_qs, urlparse
+    config = {
+        "OAUTH_CLIENT_ID": "test-client",
+        "OAUTH_AUTHORIZE_URL": "https://auth.example.com/authorize",
+        "OAUTH_TOKEN_URL": "https://auth.example.com/token",
+    }
+    idle = []
+    def fake_browser(url):
+        # Like a speculative preconnect: open a connection and never send a request
+        port = urlparse(parse_qs(urlparse(url).query)["redirect_uri"][0]).port
+        idle.append(socket.create_connection(("localhost", port)))
+        return True
+    monkeypatch.setattr("webbrowser.open", fake_browser)
+    monkeypatch.setattr(auth, "PKCE_CALLBACK_TIMEOUT", 1)
+    started = time.monotonic()
+    try:
+        with pytest.raises(RuntimeError, match="timed out"):
+            auth._acquire_pkce_token(config, "test-env")
+    finally:
+        for sock in idle:
+            sock.close()
+    assert time.monotonic() - started < 5
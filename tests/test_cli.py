@@ -16,19 +16,10 @@ from lmi.__main__ import cli, format_output, read_input_file
 
 def test_cli_version() -> None:
     """Test that the CLI version command returns the correct version string."""
-    result = subprocess.run(
-        [
-            sys.executable,
-            "-m",
-            "lmi",
-            "--version",
-        ],
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    assert result.returncode == 0
-    assert "0.1.0" in result.stdout or "0.1.0" in result.stderr
+    # In-process; test_main_entry covers the `python -m lmi` wiring in a subprocess
+    result = CliRunner().invoke(cli, ["--version"])
+    assert result.exit_code == 0
+    assert "0.1.0" in result.output
 
 def test_cli_output_json(monkeypatch, tmp_path):
     """Test that the CLI outputs valid JSON for a dummy command with --output json."""
@@ -43,13 +34,12 @@ def test_cli_output_json(monkeypatch, tmp_path):
     monkeypatch.setattr("lmi.config.CONFIG_DIR", config_dir)
     monkeypatch.setattr("lmi.config.ENV_DIR", env_dir)
     monkeypatch.setattr("lmi.config.MAIN_ENV_FILE", main_env)
-    # Patch AuthenticatedClient to a dummy in both lmi.auth and lmi.__main__
-    import lmi.__main__ as lmi_main
+    # Patch AuthenticatedClient to a dummy; lmi.__main__ resolves it lazily
     import lmi.auth
     class DummyClient:
         def __init__(self, *a, **k): pass
     monkeypatch.setattr(lmi.auth, "AuthenticatedClient", DummyClient)
-    monkeypatch.setattr(lmi_main, "AuthenticatedClient", DummyClient)
+    monkeypatch.setattr(lmi.auth, "_CLIENT_POOL", {})
 
     @cli.command()
     @click.pass_context
@@ -70,30 +60,115 @@ def test_cli_help():
     assert result.exit_code == 0
     assert "--output" in result.output
     assert "Output format" in result.output
+    assert "auth" in result.output
 
-def setup_dummy_env(monkeypatch, tmp_path):
-    config_dir = tmp_path / ".config" / "lmi"
+def test_cli_help_does_not_load_config(monkeypatch):
+    """Test that --help and --version never touch configuration files."""
+    import lmi.__main__ as lmi_main
+    def fail_load_config(*a, **k):
+        raise AssertionError("load_config should not run")
+    monkeypatch.setattr(lmi_main, "load_config", fail_load_config)
+    runner = CliRunner()
+    assert runner.invoke(cli, ["--help"]).exit_code == 0
+    assert runner.invoke(cli, ["--version"]).exit_code == 0
+
+def test_subcommand_help_skips_logging_setup(monkeypatch, dummy_env):
+    """Test that subcommand --help skips logging setup while a real invocation performs it."""
+    import lmi.logging
+    calls = []
+    monkeypatch.setattr(lmi.logging, "setup_logging", lambda **kwargs: calls.append(kwargs))
+    patch_plugin_entry_points(monkeypatch, [])
+    runner = CliRunner()
+    assert runner.invoke(cli, ["auth", "--help"]).exit_code == 0
+    assert calls == []
+    assert runner.invoke(cli, ["--no-file-log", "plugin", "list"]).exit_code == 0
+    assert calls == [{"verbosity": 0, "disable_file": True}]
+
+def test_main_version_fast_path(monkeypatch, capsys):
+    """Test that main() answers a bare --version without invoking click."""
+    import lmi.__main__ as lmi_main
+    monkeypatch.setattr(sys, "argv", ["lmi", "--version"])
+    monkeypatch.setattr(lmi_main, "cli", lambda: pytest.fail("cli should not run"))
+    lmi_main.main()
+    assert capsys.readouterr().out == "0.1.0\n"
+
+@pytest.mark.slow
+def test_cli_version_skips_heavy_imports():
+    """Test that --version does not import auth, plugin or logging modules."""
+    code = (
+        "import sys\n"
+        "from lmi.__main__ import cli\n"
+        "try:\n"
+        "    cli(['--version'])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in ('lmi.auth', 'lmi.plugins', 'lmi.logging', 'httpx') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=False)
+    assert result.returncode == 0
+    assert result.stdout.strip().endswith("[]")
+
+@pytest.fixture(autouse=True)
+def isolated_cli(monkeypatch):
+    """Keep commands that a test or fake plugin registers off the shared root group."""
+    monkeypatch.setattr(cli, "commands", dict(cli.commands))
+    monkeypatch.setattr(cli, "plugin_commands", set(cli.plugin_commands))
+
+@pytest.fixture(scope="module")
+def dummy_env_layout(tmp_path_factory):
+    """Config directory with a main .env selecting an empty testenv, built once per module."""
+    config_dir = tmp_path_factory.mktemp("home") / ".config" / "lmi"
     env_dir = config_dir / "env"
     env_dir.mkdir(parents=True)
     main_env = config_dir / ".env"
     env_file = env_dir / "testenv.env"
     main_env.write_text("default_environment=testenv\n")
     env_file.write_text("")
+    return config_dir, env_dir, main_env
+
+@pytest.fixture
+def dummy_env(monkeypatch, dummy_env_layout):
+    config_dir, env_dir, main_env = dummy_env_layout
     monkeypatch.setattr("lmi.config.CONFIG_DIR", config_dir)
     monkeypatch.setattr("lmi.config.ENV_DIR", env_dir)
     monkeypatch.setattr("lmi.config.MAIN_ENV_FILE", main_env)
 
 def patch_authenticated_client(monkeypatch):
-    import lmi.__main__ as lmi_main
     import lmi.auth
     class DummyClient:
         def __init__(self, *a, **k): pass
     monkeypatch.setattr(lmi.auth, "AuthenticatedClient", DummyClient)
-    monkeypatch.setattr(lmi_main, "AuthenticatedClient", DummyClient)
+    monkeypatch.setattr(lmi.auth, "_CLIENT_POOL", {})
+
+def patch_plugin_entry_points(monkeypatch, eps):
+    from lmi.plugins import PluginManager
+    monkeypatch.setattr("importlib.metadata.entry_points", lambda group=None: eps if group == "lmi_plugins" else [])
+    monkeypatch.setattr("lmi.plugins.plugin_manager", PluginManager())
+
+class Ep:
+    def __init__(self, name, value, dist_name, version):
+        self.name = name
+        self.value = value
+        class Dist:
+            pass
+        self.dist = Dist()
+        self.dist.name = dist_name
+        self.dist.version = version
+
+def test_cli_help_lists_plugins_without_loading_them(monkeypatch):
+    """Test that --help lists installed plugins from metadata only."""
+    class UnloadableEp(Ep):
+        def load(self):
+            raise AssertionError("--help must not import plugins")
+    patch_plugin_entry_points(monkeypatch, [UnloadableEp("foo", "foo.module:Plugin", "foo-pkg", "1.2.3")])
+    result = CliRunner().invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    assert "Plugins:" in result.output
+    assert "foo" in result.output
+    assert "Provided by foo-pkg" in result.output
 
-def test_plugin_install_success(monkeypatch, tmp_path):
+def test_plugin_install_success(monkeypatch, dummy_env):
     patch_authenticated_client(monkeypatch)
-    setup_dummy_env(monkeypatch, tmp_path)
     runner = CliRunner()
     class Result:
         returncode = 0
@@ -103,9 +178,8 @@ def test_plugin_install_success(monkeypatch, tmp_path):
     assert result.exit_code == 0
     assert "installed successfully" in result.output
 
-def test_plugin_install_failure(monkeypatch, tmp_path):
+def test_plugin_install_failure(monkeypatch, dummy_env):
     patch_authenticated_client(monkeypatch)
-    setup_dummy_env(monkeypatch, tmp_path)
     runner = CliRunner()
     class Result:
         returncode = 1
@@ -115,9 +189,8 @@ def test_plugin_install_failure(monkeypatch, tmp_path):
     assert result.exit_code != 0
     assert "Failed to install plugin" in result.output
 
-def test_plugin_uninstall_success(monkeypatch, tmp_path):
+def test_plugin_uninstall_success(monkeypatch, dummy_env):
     patch_authenticated_client(monkeypatch)
-    setup_dummy_env(monkeypatch, tmp_path)
     runner = CliRunner()
     class Result:
         returncode = 0
@@ -127,9 +200,8 @@ def test_plugin_uninstall_success(monkeypatch, tmp_path):
     assert result.exit_code == 0
     assert "uninstalled successfully" in result.output
 
-def test_plugin_uninstall_failure(monkeypatch, tmp_path):
+def test_plugin_uninstall_failure(monkeypatch, dummy_env):
     patch_authenticated_client(monkeypatch)
-    setup_dummy_env(monkeypatch, tmp_path)
     runner = CliRunner()
     class Result:
         returncode = 1
@@ -139,53 +211,183 @@ def test_plugin_uninstall_failure(monkeypatch, tmp_path):
     assert result.exit_code != 0
     assert "Failed to uninstall plugin" in result.output
 
-def test_plugin_list(monkeypatch, tmp_path):
+def test_plugin_install_passes_index_url(monkeypatch):
+    calls = []
+    class Result:
+        returncode = 0
+    def fake_run(cmd, **kwargs):
+        calls.append((cmd, kwargs))
+        return Result()
+    monkeypatch.setattr("subprocess.run", fake_run)
+    result = CliRunner().invoke(cli, ["plugin", "install", "some-plugin", "--index-url", "https://idx"])
+    assert result.exit_code == 0
+    assert calls == [(["uv", "pip", "install", "some-plugin", "--index-url", "https://idx"], {"check": False})]
+
+def test_plugin_install_batches_packages(monkeypatch):
+    calls = []
+    class Result:
+        returncode = 0
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return Result()
+    monkeypatch.setattr("subprocess.run", fake_run)
+    result = CliRunner().invoke(cli, ["plugin", "install", "a-plugin", "b-plugin"])
+    assert result.exit_code == 0
+    assert calls == [["uv", "pip", "install", "a-plugin", "b-plugin"]]
+    assert "Plugins 'a-plugin', 'b-plugin' installed successfully." in result.output
+
+def test_plugin_install_without_uv(monkeypatch):
+    def missing_uv(*a, **k):
+        raise FileNotFoundError("uv")
+    monkeypatch.setattr("subprocess.run", missing_uv)
+    result = CliRunner().invoke(cli, ["plugin", "install", "some-plugin"])
+    assert result.exit_code != 0
+    assert "uv is required" in result.output
+
+def test_plugin_list(monkeypatch, dummy_env):
     patch_authenticated_client(monkeypatch)
-    setup_dummy_env(monkeypatch, tmp_path)
     runner = CliRunner()
-    class Ep:
-        def __init__(self, name, value, dist_name):
-            self.name = name
-            self.value = value
-            class Dist:
-                name = dist_name
-            self.dist = Dist()
-    fake_eps = [Ep("foo", "foo.module:Plugin", "foo-pkg"), Ep("bar", "bar.module:Plugin", "bar-pkg")]
-    def fake_entry_points():
-        return {"lmi_plugins": fake_eps}
-    def fake_version(name):
-        return {"foo-pkg": "1.2.3", "bar-pkg": "0.9.8"}[name]
-    monkeypatch.setattr("importlib.metadata.entry_points", fake_entry_points)
-    monkeypatch.setattr("importlib.metadata.version", fake_version)
+    fake_eps = [Ep("foo", "foo.module:Plugin", "foo-pkg", "1.2.3"), Ep("bar", "bar.module:Plugin", "bar-pkg", "0.9.8")]
+    patch_plugin_entry_points(monkeypatch, fake_eps)
+    def fail_version(name):
+        raise AssertionError("version() should not be needed")
+    monkeypatch.setattr("importlib.metadata.version", fail_version)
     result = runner.invoke(cli, ["plugin", "list"])
     assert result.exit_code == 0
     assert "foo" in result.output
     assert "bar" in result.output
     assert "1.2.3" in result.output
 
-def test_plugin_list_empty(monkeypatch, tmp_path):
+def test_plugin_list_empty(monkeypatch, dummy_env):
     patch_authenticated_client(monkeypatch)
-    setup_dummy_env(monkeypatch, tmp_path)
     runner = CliRunner()
-    monkeypatch.setattr("importlib.metadata.entry_points", lambda: {"lmi_plugins": []})
+    patch_plugin_entry_points(monkeypatch, [])
     result = runner.invoke(cli, ["plugin", "list"])
     assert result.exit_code == 0
     assert "No plugins installed" in result.output
 
 def test_cli_config_error(monkeypatch, tmp_path):
-    """Test that a config error is handled and aborts CLI."""
+    """Test that a config error while loading a plugin is handled and aborts CLI."""
     import lmi.__main__ as lmi_main
+    from lmi.plugins import PluginManager
     runner = CliRunner()
     # Patch load_config to raise RuntimeError
     monkeypatch.setattr(lmi_main, "load_config", lambda *a, **k: (_ for _ in ()).throw(RuntimeError("fail config")))
-    # Add a dummy command to force config loading
-    @lmi_main.cli.command()
-    def dummy():
-        pass
-    result = runner.invoke(lmi_main.cli, ["dummy"])
+    # Resolving a plugin command forces config loading
+    pm = PluginManager()
+    monkeypatch.setattr(pm, "load_plugin", lambda name: name == "broken-plugin")
+    monkeypatch.setattr("lmi.plugins.plugin_manager", pm)
+    result = runner.invoke(lmi_main.cli, ["broken-plugin"])
     assert result.exit_code != 0
     assert "Config error" in result.output
 
+def test_plugin_loaded_on_demand(monkeypatch, dummy_env):
+    """Test that only the invoked plugin is imported and receives a CliContext."""
+    patch_authenticated_client(monkeypatch)
+    from lmi.plugins import PluginManager, hookimpl
+    loaded = []
+
+    class GreetPlugin:
+        @hookimpl
+        def register_commands(self, cli, context):
+            @cli.command("greet")
+            def greet():
+                click.echo(f"hello from {context.config['default_environment']}")
+
+    class Ep:
+        def __init__(self, name, plugin):
+            self.name = name
+            self.plugin = plugin
+        def load(self):
+            loaded.append(self.name)
+            return self.plugin
+
+    pm = PluginManager()
+    pm._entry_points = {"greet": Ep("greet", GreetPlugin()), "other": Ep("other", object())}
+    monkeypatch.setattr("lmi.plugins.plugin_manager", pm)
+    runner = CliRunner()
+    result = runner.invoke(cli, ["greet"])
+    assert result.exit_code == 0
+    assert "hello from testenv" in result.output
+    assert loaded == ["greet"]
+    result = runner.invoke(cli, ["missing-plugin"])
+    assert result.exit_code != 0
+    assert "No such command" in result.output
+
+
+def _greet_plugin_manager(contexts):
+    from lmi.plugins import PluginManager, hookimpl
+
+    class GreetPlugin:
+        @hookimpl
+        def register_commands(self, cli, context):
+            contexts.append(context)
+            @cli.command("greet")
+            @click.argument("words", nargs=-1)
+            def greet(words):
+                """Say hello."""
+                click.echo(" ".join(("hello", *words)))
+
+    class Ep:
+        name = "greet"
+        def load(self):
+            return GreetPlugin()
+
+    pm = PluginManager()
+    pm._entry_points = {"greet": Ep()}
+    return pm
+
+def test_plugin_command_sets_up_logging_before_loading_config(monkeypatch, dummy_env):
+    """Test that logging is configured before a plugin's config and client are built."""
+    import lmi.auth
+    import lmi.logging
+    import lmi.__main__ as lmi_main
+    events = []
+    real_load_config = lmi_main.load_config
+    monkeypatch.setattr(lmi.logging, "setup_logging", lambda **kwargs: events.append("setup_logging"))
+    monkeypatch.setattr(lmi_main, "load_config", lambda **kwargs: events.append("load_config") or real_load_config(**kwargs))
+    monkeypatch.setattr(lmi.auth, "get_authenticated_client", lambda *a: events.append("client"))
+    monkeypatch.setattr("lmi.plugins.plugin_manager", _greet_plugin_manager([]))
+    result = CliRunner().invoke(cli, ["greet"])
+    assert result.exit_code == 0
+    assert events == ["setup_logging", "load_config", "client"]
+
+def test_plugin_command_help_skips_config_and_client(monkeypatch, dummy_env):
+    """Test that plugin --help neither loads config nor builds an authenticated client."""
+    import lmi.auth
+    import lmi.__main__ as lmi_main
+    monkeypatch.setattr(lmi_main, "load_config", lambda **kwargs: pytest.fail("config should not load"))
+    monkeypatch.setattr(lmi.auth, "get_authenticated_client", lambda *a: pytest.fail("no client for help"))
+    contexts = []
+    monkeypatch.setattr("lmi.plugins.plugin_manager", _greet_plugin_manager(contexts))
+    result = CliRunner().invoke(cli, ["greet", "--help"])
+    assert result.exit_code == 0
+    assert "Say hello." in result.output
+    assert contexts[0].http_client is None
+
+def test_plugin_command_help_after_terminator_is_an_argument(monkeypatch, dummy_env):
+    """Test that --help after a "--" terminator is passed to the plugin, not treated as help."""
+    import lmi.auth
+    import lmi.logging
+    events = []
+    monkeypatch.setattr(lmi.logging, "setup_logging", lambda **kwargs: events.append("setup_logging"))
+    monkeypatch.setattr(lmi.auth, "get_authenticated_client", lambda *a: events.append("client") or "client")
+    contexts = []
+    monkeypatch.setattr("lmi.plugins.plugin_manager", _greet_plugin_manager(contexts))
+    result = CliRunner().invoke(cli, ["greet", "--", "--help"])
+    assert result.exit_code == 0
+    assert result.output == "hello --help\n"
+    assert events == ["setup_logging", "client"]
+    assert contexts[0].http_client == "client"
+
+def test_parse_config_overrides():
+    """Test -C KEY=VALUE parsing, including values that contain '='."""
+    from lmi.__main__ import parse_config_overrides
+    assert parse_config_overrides(("A=1", "URL=http://x?a=b", "EMPTY=")) == {"A": "1", "URL": "http://x?a=b", "EMPTY": ""}
+    with pytest.raises(click.BadParameter) as exc:
+        parse_config_overrides(("NOVALUE",))
+    assert "KEY=VALUE" in str(exc.value)
+
 
 def test_format_output_non_json(monkeypatch):
     """Test format_output with a non-json output format."""
@@ -199,6 +401,56 @@ def test_format_output_non_json(monkeypatch):
     assert dummy_echo.value == str({"foo": "bar"})
 
 
+def test_format_output_json_tty_and_pipe(monkeypatch):
+    """Test that JSON is pretty-printed on a terminal and compact when piped."""
+    import lmi.cli.io
+    echoed = []
+    monkeypatch.setattr("click.echo", echoed.append)
+    monkeypatch.setattr(lmi.cli.io, "orjson", None)
+    monkeypatch.setattr(lmi.cli.io.sys.stdout, "isatty", lambda: True)
+    lmi.cli.io.format_output({"foo": "bär", "n": [1, 2]})
+    monkeypatch.setattr(lmi.cli.io.sys.stdout, "isatty", lambda: False)
+    lmi.cli.io.format_output({"foo": "bär", "n": [1, 2]})
+    assert echoed[0] == '{\n  "foo": "bär",\n  "n": [\n    1,\n    2\n  ]\n}'
+    assert echoed[1] == '{"foo":"bär","n":[1,2]}'
+
+
+def test_format_output_json_uses_orjson_bytes(monkeypatch):
+    """Test that orjson output is passed to click.echo as bytes, falling back to json on TypeError."""
+    import lmi.cli.io
+    class FakeOrjson:
+        OPT_INDENT_2 = 1
+        @staticmethod
+        def dumps(data, option=0):
+            if "big" in data:
+                raise TypeError("Integer exceeds 64-bit range")
+            return b'{"foo":"bar"}'
+    echoed = []
+    monkeypatch.setattr("click.echo", echoed.append)
+    monkeypatch.setattr(lmi.cli.io, "orjson", FakeOrjson)
+    monkeypatch.setattr(lmi.cli.io.sys.stdout, "isatty", lambda: False)
+    lmi.cli.io.format_output({"foo": "bar"})
+    lmi.cli.io.format_output({"big": 2**70})
+    assert echoed == [b'{"foo":"bar"}', '{"big":1180591620717411303424}']
+
+
+def test_format_output_orjson_to_text_stream(monkeypatch):
+    """Test that orjson output is decoded for a stdout without a binary buffer."""
+    import contextlib
+    import lmi.cli.io
+    class FakeOrjson:
+        OPT_INDENT_2 = 1
+        @staticmethod
+        def dumps(data, option=0):
+            return '{"foo":"bär"}'.encode("utf-8")
+    monkeypatch.setattr(lmi.cli.io, "orjson", FakeOrjson)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        lmi.cli.io.format_output({"foo": "bär"})
+    assert out.getvalue() == '{"foo":"bär"}\n'
+
+
+@pytest.mark.slow
 def test_main_entry(monkeypatch):
     """Test __main__ entrypoint via subprocess."""
     import sys
@@ -207,25 +459,11 @@ def test_main_entry(monkeypatch):
     assert result.returncode == 0
     assert "Unified Platform CLI" in result.stdout or result.stderr
 
-def test_plugin_list_with_plugins(monkeypatch, tmp_path):
+def test_plugin_list_with_plugins(monkeypatch, dummy_env):
     patch_authenticated_client(monkeypatch)
     import lmi.__main__ as lmi_main
-    setup_dummy_env(monkeypatch, tmp_path)
     runner = CliRunner()
-    class Ep:
-        def __init__(self, name, value, dist_name):
-            self.name = name
-            self.value = value
-            class Dist:
-                name = dist_name
-            self.dist = Dist()
-    fake_eps = [Ep("foo", "foo.module:Plugin", "foo-pkg")]
-    def fake_entry_points():
-        return {"lmi_plugins": fake_eps}
-    def fake_version(name):
-        return {"foo-pkg": "1.2.3"}[name]
-    monkeypatch.setattr("importlib.metadata.entry_points", fake_entry_points)
-    monkeypatch.setattr("importlib.metadata.version", fake_version)
+    patch_plugin_entry_points(monkeypatch, [Ep("foo", "foo.module:Plugin", "foo-pkg", "1.2.3")])
     result = runner.invoke(lmi_main.cli, ["plugin", "list"])
     assert result.exit_code == 0
     assert "foo" in result.output
@@ -258,7 +496,39 @@ def test_read_input_file_from_stdin_empty(monkeypatch):
         read_input_file("-")
     assert "STDIN is empty" in str(exc.value)
 
+def test_read_input_file_from_stdin_bytes(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO("data from stdin ✓\r\n".encode("utf-8"))))
+    assert read_input_file("-") == "data from stdin ✓\n"
+
+def test_read_input_file_from_stdin_bytes_empty(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"   \n")))
+    with pytest.raises(click.ClickException) as exc:
+        read_input_file("-")
+    assert "STDIN is empty" in str(exc.value)
+
+def test_read_input_file_translates_newlines(tmp_path):
+    path = tmp_path / "crlf.txt"
+    path.write_bytes(b"a\r\nb\rc\n")
+    assert read_input_file(str(path)) == "a\nb\nc\n"
+
 def test_read_input_file_none():
     with pytest.raises(click.ClickException) as exc:
         read_input_file(None)
     assert "No input file specified" in str(exc.value)
+
+def test_read_input_file_from_stdin_invalid_utf8(monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"\xff\xfe data")))
+    with pytest.raises(click.ClickException) as exc:
+        read_input_file("-")
+    assert "not valid UTF-8" in str(exc.value)
+
+def test_read_input_file_large_file_mmapped(monkeypatch, tmp_path):
+    import lmi.cli.io
+    monkeypatch.setattr(lmi.cli.io, "_MMAP_MIN_SIZE", 1)
+    file_path = tmp_path / "large.json"
+    file_path.write_text('{"name": "ünïcode"}\n', encoding="utf-8")
+    assert read_input_file(str(file_path)) == '{"name": "ünïcode"}\n'
+    file_path.write_text(" \n\t\n")
+    with pytest.raises(click.ClickException) as exc:
+        read_input_file(str(file_path))
+    assert "empty" in str(exc.value)
@@ -75,7 +75,12 @@ def test_missing_required(monkeypatch) -> None:
     monkeypatch.setattr("lmi.config.REQUIRED_CONFIG_KEYS", ["FOO", "BAR"])
     with pytest.raises(RuntimeError) as exc:
         load_config(environment="testenv")
-    assert "Missing required config" in str(exc.value)
+    assert "Missing required config: BAR, FOO" in str(exc.value)
+    # Present but empty values count as missing
+    write_env_file(env_file, "FOO=set\nBAR=\n")
+    with pytest.raises(RuntimeError) as exc:
+        load_config(environment="testenv")
+    assert str(exc.value) == "Missing required config: BAR"
     shutil.rmtree(temp_dir)
 
 
@@ -129,3 +134,59 @@ def test_missing_oauth_required_key(monkeypatch):
         load_config(environment="testenv", require_oauth=True)
     assert "Missing required config" in str(exc.value)
     shutil.rmtree(temp_dir)
+
+
+def test_env_files_parsed_once_while_unchanged(monkeypatch, tmp_path):
+    """Test that unchanged .env files are served from the parse cache."""
+    config_dir = tmp_path / ".config" / "lmi"
+    env_dir = config_dir / "env"
+    env_dir.mkdir(parents=True)
+    main_env = config_dir / ".env"
+    env_file = env_dir / "testenv.env"
+    write_env_file(main_env, "default_environment=testenv\n")
+    write_env_file(env_file, "FOO=one\n")
+    monkeypatch.setattr("lmi.config.ENV_DIR", env_dir)
+    monkeypatch.setattr("lmi.config.MAIN_ENV_FILE", main_env)
+
+    import lmi.config
+
+    calls = []
+    real_dotenv_values = lmi.config.dotenv_values
+
+    def counting_dotenv_values(*args, **kwargs):
+        calls.append(args or kwargs)
+        return real_dotenv_values(*args, **kwargs)
+
+    monkeypatch.setattr(lmi.config, "dotenv_values", counting_dotenv_values)
+    first = load_config(environment="testenv")
+    # Callers get their own dict; mutating it cannot leak into the cache
+    first["FOO"] = "mutated"
+    assert load_config(environment="testenv")["FOO"] == "one"
+    assert len(calls) == 2
+
+    # A modified file is re-parsed
+    write_env_file(env_file, "FOO=two-changed\n")
+    assert load_config(environment="testenv")["FOO"] == "two-changed"
+    assert len(calls) == 3
+
+
+def test_os_environment_filtered(monkeypatch, tmp_path):
+    """Test that only configured keys and LMI_/OAUTH_ variables come from the OS environment."""
+    config_dir = tmp_path / ".config" / "lmi"
+    env_dir = config_dir / "env"
+    env_dir.mkdir(parents=True)
+    main_env = config_dir / ".env"
+    write_env_file(main_env, "default_environment=testenv\n")
+    write_env_file(env_dir / "testenv.env", "FOO=env\n")
+    monkeypatch.setattr("lmi.config.ENV_DIR", env_dir)
+    monkeypatch.setattr("lmi.config.MAIN_ENV_FILE", main_env)
+    monkeypatch.setenv("FOO", "osenv")
+    monkeypatch.setenv("OAUTH_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("LMI_EXTRA", "extra")
+    monkeypatch.setenv("UNRELATED_SHELL_VAR", "ignored")
+
+    config = load_config(environment="testenv")
+    assert config["FOO"] == "osenv"
+    assert config["OAUTH_CLIENT_SECRET"] == "secret"
+    assert config["LMI_EXTRA"] == "extra"
+    assert "UNRELATED_SHELL_VAR" not in config
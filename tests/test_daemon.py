@@ -0,0 +1,128 @@
+"""Tests for the optional resident lmi server."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from lmi import daemon
+
+
+def test_run_command_captures_output():
+    """Test that run_command captures stdout and the exit code of the CLI."""
+    result = daemon.run_command(["--version"], os.getcwd(), dict(os.environ))
+    assert result == {"stdout": "0.1.0\n", "stderr": "", "exit_code": 0}
+
+def test_run_command_restores_environment(tmp_path):
+    """Test that the caller's environment and cwd only apply during the command."""
+    cwd = os.getcwd()
+    env = {**os.environ, "LMI_DAEMON_TEST": "1"}
+    result = daemon.run_command(["--no-such-option"], str(tmp_path), env)
+    assert result["exit_code"] == 2
+    assert "No such option" in result["stderr"]
+    assert "LMI_DAEMON_TEST" not in os.environ
+    assert os.getcwd() == cwd
+
+def test_serve_round_trip(tmp_path):
+    """Test a full request and shutdown over the Unix socket."""
+    socket_path = tmp_path / "lmi.sock"
+    server = threading.Thread(target=daemon.serve, args=(socket_path,), daemon=True)
+    server.start()
+    for _ in range(100):
+        if socket_path.exists():
+            break
+        time.sleep(0.01)
+    response = daemon.send({"argv": ["--version"], "cwd": os.getcwd(), "env": dict(os.environ)}, socket_path)
+    assert response["stdout"] == "0.1.0\n"
+    assert response["exit_code"] == 0
+    daemon.send({"shutdown": True}, socket_path)
+    server.join(timeout=5)
+    assert not server.is_alive()
+    assert not socket_path.exists()
+
+def test_send_without_server(tmp_path):
+    """Test that send raises when nothing listens on the socket."""
+    with pytest.raises(OSError):
+        daemon.send({"shutdown": True}, tmp_path / "missing.sock")
+
+def test_run_command_reports_unexpected_errors(monkeypatch):
+    """Test that an exception from a command becomes a traceback and exit code 1."""
+    import lmi.__main__
+    class BrokenCli:
+        def main(self, args, prog_name):
+            print("partial output")
+            raise ValueError("plugin bug")
+    monkeypatch.setattr(lmi.__main__, "cli", BrokenCli())
+    result = daemon.run_command(["broken"], os.getcwd(), dict(os.environ))
+    assert result["stdout"] == "partial output\n"
+    assert "ValueError: plugin bug" in result["stderr"]
+    assert result["exit_code"] == 1
+
+def test_send_empty_reply(tmp_path):
+    """Test that send raises a clear error when the server hangs up without replying."""
+    import socket
+    socket_path = tmp_path / "lmi.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(socket_path))
+    listener.listen(1)
+    def hang_up():
+        conn, _ = listener.accept()
+        with conn, conn.makefile("rb") as f:
+            f.readline()
+    thread = threading.Thread(target=hang_up)
+    thread.start()
+    try:
+        with pytest.raises(ConnectionError, match="without replying"):
+            daemon.send({"argv": []}, socket_path)
+    finally:
+        thread.join(timeout=5)
+        listener.close()
+
+def test_run_command_refuses_daemon_commands(tmp_path):
+    """Test that daemon management commands are refused instead of deadlocking the server."""
+    socket_path = tmp_path / "lmi.sock"
+    result = daemon.run_command(["-e", "dev", "daemon", "stop", "--socket", str(socket_path)], os.getcwd(), dict(os.environ))
+    assert result["exit_code"] == 2
+    assert "cannot run inside the daemon" in result["stderr"]
+
+def test_run_command_reports_exit_message(monkeypatch):
+    """Test that SystemExit with a message reports it on stderr with exit code 1."""
+    import lmi.__main__
+    class ExitingCli:
+        def main(self, args, prog_name):
+            raise SystemExit("fatal: bad state")
+    monkeypatch.setattr(lmi.__main__, "cli", ExitingCli())
+    result = daemon.run_command(["broken"], os.getcwd(), dict(os.environ))
+    assert result["stderr"] == "fatal: bad state\n"
+    assert result["exit_code"] == 1
+
+class _Stdin:
+    def __init__(self, tty):
+        self.tty = tty
+    def isatty(self):
+        return self.tty
+
+@pytest.mark.parametrize("argv,tty,forwarded", [
+    (["-e", "dev", "auth", "status"], True, True),
+    (["daemon", "stop"], True, False),
+    (["-C", "daemon=1", "--", "daemon", "start"], True, False),
+    # Piped STDIN is not forwarded, so the command must run in-process
+    (["svc", "run", "--file", "-"], False, False),
+])
+def test_main_runs_locally_when_needed(monkeypatch, argv, tty, forwarded):
+    """Test which invocations lmi-client forwards to the server."""
+    import lmi.__main__
+    calls = []
+    def fake_send(request, socket_path=daemon.SOCKET_PATH):
+        calls.append("send")
+        return {"stdout": "", "stderr": "", "exit_code": 0}
+    monkeypatch.setattr(daemon, "send", fake_send)
+    monkeypatch.setattr(lmi.__main__, "main", lambda: calls.append("local"))
+    monkeypatch.setattr("sys.argv", ["lmi-client", *argv])
+    monkeypatch.setattr("sys.stdin", _Stdin(tty))
+    try:
+        daemon.main()
+    except SystemExit as e:
+        assert e.code == 0
+    assert calls == (["send"] if forwarded else ["local"])
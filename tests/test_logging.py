@@ -0,0 +1,49 @@
+import logging
+
+import pytest
+
+import lmi.logging
+from lmi.logging import setup_logging
+
+
+@pytest.fixture
+def restore_root_logging(monkeypatch):
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    monkeypatch.setattr(lmi.logging, "_LAST_SETUP", None)
+    yield root
+    for handler in root.handlers:
+        if handler not in saved_handlers:
+            handler.close()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def test_setup_logging_is_idempotent(restore_root_logging, tmp_path):
+    log_file = str(tmp_path / "lmi.log")
+    setup_logging(verbosity=1, log_file=log_file)
+    handlers = restore_root_logging.handlers[:]
+    assert restore_root_logging.level == logging.INFO
+    setup_logging(verbosity=1, log_file=log_file)
+    assert restore_root_logging.handlers == handlers
+    # Different options rebuild the handlers
+    setup_logging(verbosity=2, log_file=log_file, disable_file=True)
+    assert restore_root_logging.handlers != handlers
+    assert restore_root_logging.level == logging.DEBUG
+    assert not any(isinstance(h, logging.FileHandler) for h in restore_root_logging.handlers)
+
+
+def test_setup_logging_reinstalls_replaced_handlers(restore_root_logging, tmp_path):
+    setup_logging(verbosity=0, disable_file=True)
+    restore_root_logging.handlers[:] = []
+    setup_logging(verbosity=0, disable_file=True)
+    assert restore_root_logging.handlers
+
+
+def test_log_file_created_on_first_record(restore_root_logging, tmp_path):
+    log_path = tmp_path / "nested" / "dir" / "lmi.log"
+    setup_logging(verbosity=0, log_file=str(log_path))
+    logging.getLogger("lmi.test").info("filtered out at WARNING")
+    assert not log_path.parent.exists()
+    logging.getLogger("lmi.test").warning("written")
+    assert "written" in log_path.read_text(encoding="utf-8")
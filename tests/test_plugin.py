@@ -1,5 +1,6 @@
 import click
 from click.testing import CliRunner
+import pytest
 
 from lmi.plugins import PluginManager, hookimpl
 
@@ -36,3 +37,35 @@ def test_registers_command():
     result = runner.invoke(cli, ["testgroup", "hello"])
     assert result.exit_code == 0
     assert "Hello from test plugin!" in result.output
+
+
+def test_cli_context_auth_token_follows_client_refresh():
+    import time
+    from lmi.auth import AuthToken
+    from lmi.plugins import CliContext
+
+    class DummyClient:
+        token = AuthToken(access_token="first", expires_at=int(time.time()) + 60)
+
+    client = DummyClient()
+    context = CliContext({}, None, client, {})
+    assert context.auth_token.access_token == "first"
+    assert context.is_authenticated()
+    # The client swaps in a refreshed token; the context must not keep the old one
+    client.token = AuthToken(access_token="second", expires_at=int(time.time()) - 1)
+    assert context.auth_token.access_token == "second"
+    assert not context.is_authenticated()
+    assert CliContext({}, None, None, {}).get_auth_status()["logged_in"] is False
+
+
+@pytest.mark.slow
+def test_plugins_module_does_not_import_httpx():
+    import subprocess
+    import sys
+    code = (
+        "import sys, lmi.plugins\n"
+        "print('httpx' in sys.modules)\n"
+        "print(lmi.plugins.AuthToken.__module__, lmi.plugins.auth.__name__)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "lmi.auth", "lmi.auth"]